@@ -7,52 +7,69 @@ This is a READ-ONLY endpoint that formats existing data.
 Does NOT modify any existing endpoints or calculations.
 """
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Response, status
+from typing import Optional, Dict, Any, Iterable
+import asyncio
 import logging
 from datetime import datetime, timezone
 
 from utils.database import db
 from routes.auth_routes import verify_token
-from reporting.yoyo_report_v2 import format_yoyo_report_v2, validate_report_structure
+from reporting.yoyo_report_v2 import YoYoReportV2Formatter, validate_report_structure, dumps_report
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-@router.get("/yoyo/{player_id}")
-async def get_yoyo_report_v2(
+def _json_response(payload: Dict[str, Any]) -> Response:
+    """Return a pre-serialized JSON response (skips FastAPI's jsonable_encoder pass)."""
+    return Response(content=dumps_report(payload), media_type="application/json")
+
+
+def _match_ids(player_id: str, user_id: Optional[str], field: str) -> Dict[str, Any]:
+    """Query matching `field` against either the requested player or the caller."""
+    return {"$or": [{field: player_id}, {field: user_id}]}
+
+
+async def _build_yoyo_report(
     player_id: str,
-    current_user: dict = Depends(verify_token)
-):
+    current_user: dict,
+    only: Optional[Iterable[int]] = None,
+    include_json: bool = True
+) -> Dict[str, Any]:
     """
-    Get YoYo Report v2 for a player.
+    Fetch existing data for a player and format it as YoYo Report v2.
     
-    This is a presentation-only endpoint that:
-    - Reads existing data from database
-    - Formats it into the standardized 11-section report
-    - Returns machine-readable JSON object
-    
-    NO NEW CALCULATIONS. NO DATA MODIFICATIONS.
-    
-    Args:
-        player_id: The player/user ID to generate report for
-    
-    Returns:
-        YoYo Report v2 with:
-        - report_sections: List of 11 sections in fixed order
-        - report_json: Machine-readable JSON with required schema
-        - meta: Report metadata
+    `only` / `include_json` restrict which parts are built; structure
+    validation runs only for the full report.
     """
     try:
         user_id = current_user.get('user_id') or current_user.get('id')
         
         logger.info(f"Generating YoYo Report v2 for player_id: {player_id}")
         
-        # Fetch user profile
-        user = await db.users.find_one(
-            {"$or": [{"id": player_id}, {"id": user_id}]},
-            {"_id": 0}
+        # Profile, training program, generated report and match history
+        # depend only on the ids, so fetch them concurrently
+        user, training_program, generated_report, match_history = await asyncio.gather(
+            # Fetch user profile
+            db.users.find_one(_match_ids(player_id, user_id, "id"), {"_id": 0}),
+            # Fetch training program if exists
+            db.training_programs.find_one(
+                _match_ids(player_id, user_id, "player_id"),
+                {"_id": 0},
+                sort=[("created_at", -1)]
+            ),
+            # Fetch comprehensive report if exists (has AI analysis)
+            db.comprehensive_reports.find_one(
+                _match_ids(player_id, user_id, "user_id"),
+                {"_id": 0},
+                sort=[("generated_at", -1)]
+            ),
+            # Fetch match history if exists
+            db.matches.find(
+                _match_ids(player_id, user_id, "player_id"),
+                {"_id": 0}
+            ).sort("date", -1).limit(10).to_list(10)
         )
         
         # Get player name for additional lookups
@@ -85,35 +102,6 @@ async def get_yoyo_report_v2(
             sort=[("benchmark_date", -1)]
         )
         
-        # Fetch training program if exists
-        training_program = await db.training_programs.find_one(
-            {"$or": [
-                {"player_id": player_id},
-                {"player_id": user_id}
-            ]},
-            {"_id": 0},
-            sort=[("created_at", -1)]
-        )
-        
-        # Fetch comprehensive report if exists (has AI analysis)
-        generated_report = await db.comprehensive_reports.find_one(
-            {"$or": [
-                {"user_id": player_id},
-                {"user_id": user_id}
-            ]},
-            {"_id": 0},
-            sort=[("generated_at", -1)]
-        )
-        
-        # Fetch match history if exists
-        match_history = await db.matches.find(
-            {"$or": [
-                {"player_id": player_id},
-                {"player_id": user_id}
-            ]},
-            {"_id": 0}
-        ).sort("date", -1).limit(10).to_list(10)
-        
         # Check if we have minimum data (at least assessment or user)
         if not assessment and not user:
             raise HTTPException(
@@ -122,7 +110,7 @@ async def get_yoyo_report_v2(
             )
         
         # Generate the report
-        report = format_yoyo_report_v2(
+        formatter = YoYoReportV2Formatter(
             user=user,
             assessment=assessment,
             benchmark=benchmark,
@@ -131,11 +119,17 @@ async def get_yoyo_report_v2(
             match_history=match_history,
             generated_report=generated_report
         )
+        report = formatter.generate_report(only=only, include_json=include_json)
         
         # Validate report structure
-        validation = validate_report_structure(report)
-        if not validation['valid']:
-            logger.warning(f"Report validation warnings: {validation['errors']}")
+        validation = None
+        if only is None and include_json:
+            validation = validate_report_structure(report)
+            if not validation['valid']:
+                logger.warning(f"Report validation warnings: {validation['errors']}")
+        
+        # Reuse already-serialized report_json bytes when the report was cached
+        formatter.embed_json_fragment(report)
         
         logger.info(f"Successfully generated YoYo Report v2 for player_id: {player_id}")
         
@@ -156,6 +150,33 @@ async def get_yoyo_report_v2(
         )
 
 
+@router.get("/yoyo/{player_id}")
+async def get_yoyo_report_v2(
+    player_id: str,
+    current_user: dict = Depends(verify_token)
+):
+    """
+    Get YoYo Report v2 for a player.
+    
+    This is a presentation-only endpoint that:
+    - Reads existing data from database
+    - Formats it into the standardized 11-section report
+    - Returns machine-readable JSON object
+    
+    NO NEW CALCULATIONS. NO DATA MODIFICATIONS.
+    
+    Args:
+        player_id: The player/user ID to generate report for
+    
+    Returns:
+        YoYo Report v2 with:
+        - report_sections: List of 11 sections in fixed order
+        - report_json: Machine-readable JSON with required schema
+        - meta: Report metadata
+    """
+    return _json_response(await _build_yoyo_report(player_id, current_user))
+
+
 @router.get("/yoyo/{player_id}/sections")
 async def get_yoyo_report_sections_only(
     player_id: str,
@@ -165,14 +186,14 @@ async def get_yoyo_report_sections_only(
     Get only the 11 sections of YoYo Report v2 (without full JSON).
     Lighter payload for frontend rendering.
     """
-    result = await get_yoyo_report_v2(player_id, current_user)
+    result = await _build_yoyo_report(player_id, current_user, include_json=False)
     
-    return {
+    return _json_response({
         "success": True,
         "player_id": player_id,
         "sections": result['report']['report_sections'],
         "meta": result['report']['meta']
-    }
+    })
 
 
 @router.get("/yoyo/{player_id}/json")
@@ -184,11 +205,11 @@ async def get_yoyo_report_json_only(
     Get only the JSON object of YoYo Report v2.
     Machine-readable data for integrations.
     """
-    result = await get_yoyo_report_v2(player_id, current_user)
+    result = await _build_yoyo_report(player_id, current_user, only=())
     
-    return {
+    return _json_response({
         "success": True,
         "player_id": player_id,
         "json": result['report']['report_json'],
         "meta": result['report']['meta']
-    }
+    })
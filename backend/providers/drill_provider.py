@@ -11,17 +11,26 @@ Environment Variables:
   - db: DB only (if empty/unavailable → error)
   - static: Static only (ignore DB)
 - DRILLS_DB_FALLBACK: 'true' | 'false' (default: 'true', only used in auto mode)
+
+The auto-mode decision and DB reachability are cached for DB_PROBE_TTL_SECONDS
+so request paths do not issue a count query on every call.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from repositories.drill_repository import DrillRepository, get_drill_repository
 from exercise_database import EXERCISE_DATABASE
+import asyncio
 import logging
 import os
+import time
+from dataclasses import dataclass
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# How long a DB probe (drill count) result is reused
+DB_PROBE_TTL_SECONDS = 2.0
+
 
 class DrillsSourceMode(str, Enum):
     """Drill source modes."""
@@ -37,6 +46,36 @@ class DrillsNotAvailableError(Exception):
         super().__init__(message)
 
 
+@dataclass(frozen=True, slots=True)
+class DrillProviderConfig:
+    """Drill source settings, resolved once from the environment."""
+    source_mode: DrillsSourceMode
+    is_static: bool
+    is_db_only: bool
+    is_auto: bool
+    db_fallback: bool
+    
+    @classmethod
+    def from_env(cls) -> "DrillProviderConfig":
+        """Build config from DRILLS_SOURCE and DRILLS_DB_FALLBACK."""
+        mode = os.environ.get('DRILLS_SOURCE', 'auto').lower()
+        try:
+            source_mode = DrillsSourceMode(mode)
+        except ValueError:
+            logger.warning(f"Invalid DRILLS_SOURCE '{mode}', defaulting to 'auto'")
+            source_mode = DrillsSourceMode.AUTO
+        
+        is_static = source_mode is DrillsSourceMode.STATIC
+        is_db_only = source_mode is DrillsSourceMode.DB
+        return cls(
+            source_mode=source_mode,
+            is_static=is_static,
+            is_db_only=is_db_only,
+            is_auto=not (is_static or is_db_only),
+            db_fallback=os.environ.get('DRILLS_DB_FALLBACK', 'true').lower() == 'true'
+        )
+
+
 class DrillProvider:
     """
     Provider for drill selection with configurable source strategy.
@@ -47,24 +86,25 @@ class DrillProvider:
     - static: Static only, ignore DB
     """
     
-    def __init__(self, repository: Optional[DrillRepository] = None):
-        self._repository = repository
-        self._source_mode = self._get_source_mode()
-        self._db_fallback = os.environ.get('DRILLS_DB_FALLBACK', 'true').lower() == 'true'
+    __slots__ = ('_repository', '_cfg', '_use_db', '_db_reachable', '_probe_expires_at', '_probe_task')
     
-    def _get_source_mode(self) -> DrillsSourceMode:
-        """Get the drill source mode from environment."""
-        mode = os.environ.get('DRILLS_SOURCE', 'auto').lower()
-        try:
-            return DrillsSourceMode(mode)
-        except ValueError:
-            logger.warning(f"Invalid DRILLS_SOURCE '{mode}', defaulting to 'auto'")
-            return DrillsSourceMode.AUTO
+    def __init__(
+        self,
+        repository: Optional[DrillRepository] = None,
+        config: Optional[DrillProviderConfig] = None
+    ):
+        self._repository = repository
+        self._cfg = config or DrillProviderConfig.from_env()
+        # Cached DB probe state (see _refresh_db_probe)
+        self._use_db = self._cfg.is_db_only
+        self._db_reachable = False
+        self._probe_expires_at = 0.0
+        self._probe_task: Optional[asyncio.Future] = None
     
     @property
     def source_mode(self) -> str:
         """Get current source mode as string."""
-        return self._source_mode.value
+        return self._cfg.source_mode.value
     
     @property
     def repository(self) -> DrillRepository:
@@ -73,13 +113,46 @@ class DrillProvider:
             self._repository = get_drill_repository()
         return self._repository
     
-    async def _get_db_count(self) -> int:
-        """Get count of drills in database."""
+    def _record_db_probe(self, db_count: Optional[int]) -> None:
+        """
+        Cache the auto-mode decision and DB reachability.
+        
+        Args:
+            db_count: Active drill count, or None if the DB could not be reached
+        """
+        self._db_reachable = db_count is not None
+        cfg = self._cfg
+        self._use_db = cfg.is_db_only or (cfg.is_auto and bool(db_count))
+        self._probe_expires_at = time.monotonic() + DB_PROBE_TTL_SECONDS
+    
+    async def _probe_db(self) -> None:
+        """Count drills in database and record the result."""
         try:
-            return await self.repository.count_drills()
+            db_count = await self.repository.count_drills()
         except Exception as e:
             logger.warning(f"DB count failed: {e}")
-            return 0
+            db_count = None
+        self._record_db_probe(db_count)
+    
+    async def _refresh_db_probe(self) -> None:
+        """
+        Re-count drills in database if the cached probe has expired.
+        
+        Concurrent callers (e.g. gathered provider calls) share a single
+        in-flight count instead of each issuing one.
+        """
+        if time.monotonic() < self._probe_expires_at:
+            return
+        task = self._probe_task
+        if task is None:
+            task = self._probe_task = asyncio.ensure_future(self._probe_db())
+            task.add_done_callback(self._clear_probe_task)
+        # shield: a cancelled caller must not cancel the shared probe
+        await asyncio.shield(task)
+    
+    def _clear_probe_task(self, task: asyncio.Future) -> None:
+        if self._probe_task is task:
+            self._probe_task = None
     
     async def _should_use_db(self) -> bool:
         """
@@ -88,15 +161,15 @@ class DrillProvider:
         Returns:
             True if DB should be used, False for static
         """
-        if self._source_mode == DrillsSourceMode.STATIC:
+        if self._cfg.is_static:
             return False
         
-        if self._source_mode == DrillsSourceMode.DB:
+        if self._cfg.is_db_only:
             return True
         
         # Auto mode: use DB if has drills
-        db_count = await self._get_db_count()
-        return db_count > 0
+        await self._refresh_db_probe()
+        return self._use_db
     
     async def get_active_source(self) -> str:
         """Get which source is currently active."""
@@ -177,23 +250,23 @@ class DrillProvider:
             try:
                 drill = await self.repository.find_by_id(drill_id)
                 if drill:
-                    drill['_source'] = 'database'
                     logger.debug(f"Drill '{drill_id}' loaded from database")
                     return drill
             except Exception as e:
                 logger.warning(f"DB lookup failed for drill '{drill_id}': {e}")
-                if self._source_mode == DrillsSourceMode.DB:
+                if self._cfg.is_db_only:
                     raise DrillsNotAvailableError(f"Database error: {e}")
         
         # Check if we should fallback to static
-        if self._source_mode == DrillsSourceMode.DB:
+        if self._cfg.is_db_only:
             # DB mode with no result = not found
             return None
         
         # Fallback to static (auto or static mode)
-        if drill_id in EXERCISE_DATABASE:
+        drill_data = EXERCISE_DATABASE.get(drill_id)
+        if drill_data is not None:
             logger.debug(f"Drill '{drill_id}' loaded from static database")
-            return self._convert_static_drill(drill_id, EXERCISE_DATABASE[drill_id])
+            return self._convert_static_drill(drill_id, drill_data)
         
         return None
     
@@ -209,13 +282,11 @@ class DrillProvider:
         if use_db:
             try:
                 drills = await self.repository.find_by_section(section)
-                for drill in drills:
-                    drill['_source'] = 'database'
                 logger.debug(f"Loaded {len(drills)} DB drills for section '{section}'")
                 return drills
             except Exception as e:
                 logger.warning(f"DB lookup failed for section '{section}': {e}")
-                if self._source_mode == DrillsSourceMode.DB:
+                if self._cfg.is_db_only:
                     raise DrillsNotAvailableError(f"Database error: {e}")
         
         # Static mode or fallback
@@ -248,16 +319,62 @@ class DrillProvider:
                     age=age,
                     position=position
                 )
-                for drill in drills:
-                    drill['_source'] = 'database'
                 logger.info(f"Loaded {len(drills)} drills from database")
                 return drills
             except Exception as e:
                 logger.warning(f"DB drill load failed: {e}")
-                if self._source_mode == DrillsSourceMode.DB:
+                if self._cfg.is_db_only:
                     raise DrillsNotAvailableError(f"Database error: {e}")
         
         # Static mode or fallback
+        drills = self._filter_static_drills(section, tag)
+        logger.info(f"Loaded {len(drills)} drills from static database")
+        return drills
+    
+    async def get_all_drills_paginated(
+        self,
+        section: Optional[str] = None,
+        tag: Optional[str] = None,
+        age: Optional[int] = None,
+        position: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one page of drills plus the total number of matches.
+        
+        From the database only the requested page is fetched, together with
+        the total in one $facet aggregation; static drills are filtered and
+        sliced in memory.
+        """
+        use_db = await self._should_use_db()
+        
+        if use_db:
+            try:
+                page = await self.repository.find_page(
+                    section=section,
+                    tag=tag,
+                    age=age,
+                    position=position,
+                    skip=skip,
+                    limit=limit
+                )
+                return page["rows"], page["total"]
+            except Exception as e:
+                logger.warning(f"DB drill page load failed: {e}")
+                if self._cfg.is_db_only:
+                    raise DrillsNotAvailableError(f"Database error: {e}")
+        
+        # Static mode or fallback
+        drills = self._filter_static_drills(section, tag)
+        return drills[skip:skip + limit], len(drills)
+    
+    def _filter_static_drills(
+        self,
+        section: Optional[str] = None,
+        tag: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Convert static drills, keeping those matching section/tag."""
         drills = []
         for drill_id, drill_data in EXERCISE_DATABASE.items():
             converted = self._convert_static_drill(drill_id, drill_data)
@@ -270,8 +387,6 @@ class DrillProvider:
             # Age and position filtering not supported for static drills
             
             drills.append(converted)
-        
-        logger.info(f"Loaded {len(drills)} drills from static database")
         return drills
     
     async def search_drills(
@@ -297,15 +412,14 @@ class DrillProvider:
                     tags=tags,
                     contraindications_exclude=exclude_contraindications
                 )
-                for drill in drills:
-                    drill['_source'] = 'database'
                 return drills
             except Exception as e:
                 logger.warning(f"DB drill search failed: {e}")
-                if self._source_mode == DrillsSourceMode.DB:
+                if self._cfg.is_db_only:
                     raise DrillsNotAvailableError(f"Database error: {e}")
         
         # Static mode or fallback - basic filtering
+        req_tags = frozenset(tags) if tags else None
         drills = []
         for drill_id, drill_data in EXERCISE_DATABASE.items():
             converted = self._convert_static_drill(drill_id, drill_data)
@@ -315,7 +429,7 @@ class DrillProvider:
                 continue
             if intensity and converted.get('intensity') != intensity:
                 continue
-            if tags and not any(t in converted.get('tags', []) for t in tags):
+            if req_tags and req_tags.isdisjoint(converted.get('tags', [])):
                 continue
             if query:
                 if query.lower() not in converted['name'].lower():
@@ -335,19 +449,25 @@ class DrillProvider:
         db_available = False
         sections = {}
         
+        # Total and per-section counts in a single aggregation
         try:
-            db_count = await self.repository.count_drills()
-            sections = await self.repository.count_by_section()
-            db_available = True
+            db_stats = await self.repository.page_with_stats(limit=0)
         except Exception as e:
             logger.warning(f"DB stats failed: {e}")
+            self._record_db_probe(None)
+        else:
+            db_count = db_stats["total"]
+            self._record_db_probe(db_count)
+            sections = db_stats["by_section"]
+            db_available = True
         
+        # Fresh count was just recorded, so this reads the cached decision
         active_source = await self.get_active_source()
         
         return {
             "db_count": db_count,
             "static_count": static_count,
-            "source_mode": self._source_mode.value,
+            "source_mode": self.source_mode,
             "active_source": active_source,
             "db_available": db_available,
             "sections": sections
@@ -359,11 +479,8 @@ class DrillProvider:
     
     async def is_db_available(self) -> bool:
         """Check if database is available for drill storage."""
-        try:
-            await self.repository.count_drills()
-            return True
-        except Exception:
-            return False
+        await self._refresh_db_probe()
+        return self._db_reachable
 
 
 # Singleton instance
@@ -10,6 +10,8 @@ from .yoyo_report_v2 import (
     YoYoReportV2Formatter,
     format_yoyo_report_v2,
     validate_report_structure,
+    dumps_report,
+    clear_report_caches,
     SECTION_TITLES
 )
 
@@ -17,5 +19,7 @@ __all__ = [
     'YoYoReportV2Formatter',
     'format_yoyo_report_v2',
     'validate_report_structure',
+    'dumps_report',
+    'clear_report_caches',
     'SECTION_TITLES'
 ]
@@ -22,15 +22,34 @@ Sections (FIXED ORDER - DO NOT REORDER):
 11. Goal State
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Iterable, FrozenSet, Union
+from collections import OrderedDict, namedtuple
+from dataclasses import dataclass, asdict, is_dataclass
 from datetime import datetime, timezone
+import hashlib
+import json
 import logging
+import re
+import sys
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+# orjson.Fragment (orjson >= 3.9) embeds already-serialized JSON without re-encoding
+JSON_FRAGMENTS_AVAILABLE = ORJSON_AVAILABLE and hasattr(orjson, "Fragment")
 
 logger = logging.getLogger(__name__)
 
 
+# Placeholder for missing values; one shared string object for every report
+_NA = sys.intern("N/A")
+
 # Section titles - FIXED ORDER, DO NOT REORDER
-SECTION_TITLES = [
+SECTION_TITLES = (
     "Identity & Biology",
     "Performance Snapshot",
     "Strengths & Weaknesses",
@@ -42,7 +61,157 @@ SECTION_TITLES = [
     "Safety Governor",
     "AI Object (JSON)",
     "Goal State"
-]
+)
+
+
+# Section 2 metric groups: (group, ((assessment_key, label), ...)) in display order
+_METRIC_GROUPS = (
+    ("physical_metrics", (
+        ("sprint_30m", "30m Sprint Time (seconds)"),
+        ("yo_yo_test", "Yo-Yo IR Test (meters)"),
+        ("vo2_max", "VO2 Max (ml/kg/min)"),
+        ("vertical_jump", "Vertical Jump (cm)"),
+        ("body_fat", "Body Fat (%)"),
+    )),
+    ("technical_metrics", (
+        ("ball_control", "Ball Control (1-5)"),
+        ("passing_accuracy", "Passing Accuracy (%)"),
+        ("dribbling_success", "Dribbling Success (%)"),
+        ("shooting_accuracy", "Shooting Accuracy (%)"),
+        ("defensive_duels", "Defensive Duels Won (%)"),
+    )),
+    ("tactical_metrics", (
+        ("game_intelligence", "Game Intelligence (1-5)"),
+        ("positioning", "Positioning (1-5)"),
+        ("decision_making", "Decision Making (1-5)"),
+    )),
+    ("psychological_metrics", (
+        ("coachability", "Coachability (1-5)"),
+        ("mental_toughness", "Mental Toughness (1-5)"),
+    )),
+)
+
+# Every assessment key read by section 2, for one batched extraction
+_METRIC_KEYS = tuple(key for _, metrics in _METRIC_GROUPS for key, _ in metrics)
+
+# Goalkeeper position variants (substring match, any case)
+_GK_RE = re.compile(r"goalkeeper|gk|keeper|goalie|portero|gardien", re.IGNORECASE)
+
+# Placeholder strings stored for "no injuries" (e.g. registration sends 'None')
+_NO_INJURY_VALUES = frozenset({"none", "n/a", "na", "no", "nil", "-"})
+
+
+def _has_injury(value: Any) -> bool:
+    """True if an injury field holds real injury data rather than a placeholder."""
+    if isinstance(value, str):
+        value = value.strip()
+        return bool(value) and value.lower() not in _NO_INJURY_VALUES
+    return bool(value)
+
+
+# Keyword table for classifying coach recommendations into training
+# categories. Matching is case-insensitive substring search; a
+# recommendation can land in several categories.
+_CATEGORY_KEYWORDS = (
+    ("technical", ("tech", "skill")),
+    ("tactical", ("tactical", "position")),
+    ("possession", ("pass", "possess")),
+    ("speed_agility", ("speed", "agil", "sprint")),
+    ("cardio", ("cardio", "endurance", "aerobic")),
+    ("gym", ("strength", "gym", "weight")),
+    ("mobility", ("flex", "mobil", "stretch")),
+    ("recovery", ("recovery", "rest")),
+    ("prehab", ("injury", "prevent", "prehab")),
+)
+
+
+# All keywords in one alternation, one named group per category. The
+# zero-width lookahead lets overlapping keywords (e.g. "rest" in
+# "restretch") still report every category, matching plain `in` checks.
+_CATEGORY_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in _CATEGORY_KEYWORDS
+    ) + ")",
+    re.IGNORECASE
+)
+
+
+def _classify_recs(recs: List[str]) -> Dict[str, List[str]]:
+    """Bucket recommendations by category with one regex scan per item."""
+    buckets: Dict[str, List[str]] = {category: [] for category, _ in _CATEGORY_KEYWORDS}
+    for rec in recs:
+        for category in {m.lastgroup for m in _CATEGORY_RE.finditer(rec)}:
+            buckets[category].append(rec)
+    return buckets
+
+
+def _json_default(value: Any) -> Any:
+    """stdlib json fallback hook mirroring orjson's native type handling."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    return str(value)
+
+
+def dumps_report(obj: Any) -> bytes:
+    """
+    Serialize a report (or a response payload wrapping one) to JSON bytes.
+    
+    Uses orjson when installed; falls back to stdlib json otherwise. Both
+    paths serialize dataclasses as objects and datetimes as ISO 8601 (UTC
+    as 'Z'); other values JSON cannot represent (e.g. ObjectId) are
+    stringified.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        )
+    return json.dumps(obj, default=_json_default, ensure_ascii=False).encode("utf-8")
+
+
+@dataclass(slots=True)
+class _CachedReport:
+    """A rendered report; json_bytes is filled on first serialization."""
+    sections: Tuple[Dict[str, Any], ...]
+    report_json: Dict[str, Any]
+    json_bytes: Optional[bytes] = None
+
+
+# Rendered reports keyed by input fingerprint. Each caller gets a fresh
+# sections list, but section dicts and report_json are shared between
+# callers and must be treated as read-only.
+REPORT_CACHE_MAXSIZE = 256
+_report_cache: "OrderedDict[bytes, _CachedReport]" = OrderedDict()
+
+
+def _fingerprint(payload: Any) -> bytes:
+    """Stable content hash of formatter inputs."""
+    if ORJSON_AVAILABLE:
+        raw = orjson.dumps(
+            payload,
+            default=str,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        )
+    else:
+        raw = json.dumps(payload, default=str, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def clear_report_caches() -> None:
+    """Drop all memoized reports (e.g. after bulk data changes, or in tests)."""
+    _report_cache.clear()
+
+
+def _first(*values: Any, default: Any = None) -> Any:
+    """Return the first truthy value, else default."""
+    for value in values:
+        if value:
+            return value
+    return default
 
 
 def _safe_get(data: Optional[Dict], *keys, default: Any = "") -> Any:
@@ -58,6 +227,49 @@ def _safe_get(data: Optional[Dict], *keys, default: Any = "") -> Any:
     return result if result is not None else default
 
 
+def _g1(data: Optional[Dict], key: str, default: Any = "") -> Any:
+    """_safe_get(data, key) without *keys packing or the loop."""
+    value = data.get(key) if data else None
+    return default if value is None else value
+
+
+def _g2(data: Optional[Dict], key1: str, key2: str, default: Any = "") -> Any:
+    """_safe_get(data, key1, key2) without *keys packing or the loop."""
+    inner = data.get(key1) if data else None
+    if not isinstance(inner, dict):
+        return default
+    value = inner.get(key2)
+    return default if value is None else value
+
+
+@dataclass(slots=True)
+class _GenReportView:
+    """Fields of a previously generated report, resolved once per formatter."""
+    strengths: List[str]
+    weaknesses: List[str]
+    perf_level: str
+    ai_analysis: str
+    coach_recs: List[str]
+    roadmap: Dict[str, Any]
+    standards: Dict[str, Any]
+    
+    @classmethod
+    def from_dict(cls, report: Optional[Dict[str, Any]]) -> "_GenReportView":
+        return cls(
+            strengths=_g1(report, 'strengths') or [],
+            weaknesses=_g1(report, 'weaknesses') or [],
+            perf_level=_g2(report, 'scores', 'performance_level') or "",
+            ai_analysis=_g1(report, 'ai_analysis') or "",
+            coach_recs=_g1(report, 'coach_recommendations') or [],
+            roadmap=_g1(report, 'development_roadmap') or {},
+            standards=_g1(report, 'standards_comparison') or {}
+        )
+
+
+# Values several sections and the JSON object derive from the same inputs
+_Resolved = namedtuple("_Resolved", "mode perf_level weekly_schedule")
+
+
 class YoYoReportV2Formatter:
     """
     Presentation layer that formats existing data into YoYo Report v2.
@@ -66,6 +278,12 @@ class YoYoReportV2Formatter:
     It only formats what already exists from the backend.
     """
     
+    __slots__ = (
+        "user", "assessment", "benchmark", "training_program",
+        "injury_data", "match_history", "generated_report", "_gr", "_rec_buckets",
+        "_identity", "_fp", "_res"
+    )
+    
     def __init__(
         self,
         user: Optional[Dict[str, Any]] = None,
@@ -95,43 +313,157 @@ class YoYoReportV2Formatter:
         self.injury_data = injury_data or {}
         self.match_history = match_history or []
         self.generated_report = generated_report or {}
+        self._gr = _GenReportView.from_dict(self.generated_report)
+        self._rec_buckets: Optional[Dict[str, List[str]]] = None
+        self._identity = self._resolve_identity()
+        self._fp: Optional[bytes] = None
+        self._res: Optional[_Resolved] = None
+    
+    def _resolve_identity(self) -> Dict[str, Any]:
+        """Identity fields (assessment first, then user profile); None when missing."""
+        a, u = self.assessment, self.user
+        return {
+            "player_name": _first(a.get('player_name'), u.get('full_name'), u.get('username')),
+            "age": _first(a.get('age'), u.get('age')),
+            "gender": _first(a.get('gender'), u.get('gender')),
+            "position": _first(a.get('position'), u.get('position')),
+            "dominant_leg": _first(a.get('dominant_foot'), u.get('dominant_foot')),
+            "height_cm": _first(a.get('height_cm'), u.get('height_cm')),
+            "weight_kg": _first(a.get('weight_kg'), u.get('weight_kg'))
+        }
         
-    def generate_report(self) -> Dict[str, Any]:
+    def fingerprint(self) -> bytes:
+        """Hash of all formatter inputs, used as the report cache key (computed once)."""
+        if self._fp is None:
+            self._fp = _fingerprint((
+                self.user,
+                self.assessment,
+                self.benchmark,
+                self.training_program,
+                self.injury_data,
+                self.match_history,
+                self.generated_report
+            ))
+        return self._fp
+    
+    def generate_report(
+        self,
+        use_cache: bool = True,
+        only: Optional[Iterable[int]] = None,
+        include_json: bool = True,
+        generated_at: Optional[datetime] = None
+    ) -> Dict[str, Any]:
         """
         Generate complete YoYo Report v2 with 11 sections + JSON.
         
+        Identical inputs reuse the previously rendered sections and JSON
+        object; only meta is rebuilt per call.
+        
+        Args:
+            use_cache: Set False to force a fresh render
+            only: Section numbers (1-11) to build; None builds all sections
+            include_json: Set False to skip building report_json
+            generated_at: Timestamp for meta (e.g. one clock read shared by a
+                batch); defaults to now (UTC)
+        
         Returns:
             Dict with:
                 - report_sections: List of 11 sections in fixed order
-                - report_json: Machine-readable JSON object
+                  (or the requested subset, still in fixed order)
+                - report_json: Machine-readable JSON object (if include_json)
                 - meta: Report metadata
         """
-        sections = [
-            self._section_1_identity_biology(),
-            self._section_2_performance_snapshot(),
-            self._section_3_strengths_weaknesses(),
-            self._section_4_development_identity(),
-            self._section_5_benchmarks(),
-            self._section_6_training_mode(),
-            self._section_7_training_program(),
-            self._section_8_return_to_play(),
-            self._section_9_safety_governor(),
-            self._section_10_ai_object(),
-            self._section_11_goal_state()
+        wanted = None if only is None else frozenset(only)
+        key = self.fingerprint() if use_cache else None
+        cached = _report_cache.get(key) if use_cache else None
+        if cached is not None:
+            _report_cache.move_to_end(key)
+            sections, report_json = list(cached.sections), cached.report_json
+            if wanted is not None:
+                sections = [sec for sec in sections if sec['section_number'] in wanted]
+        else:
+            # Only full renders are cached; partial ones build just what was asked
+            sections = self._build_sections(wanted)
+            report_json = self._build_json_object() if include_json else None
+            if use_cache and wanted is None and include_json:
+                _report_cache[key] = _CachedReport(tuple(sections), report_json)
+                if len(_report_cache) > REPORT_CACHE_MAXSIZE:
+                    _report_cache.popitem(last=False)
+        
+        report: Dict[str, Any] = {"report_sections": sections}
+        if include_json:
+            report["report_json"] = report_json
+        report["meta"] = {
+            "report_version": "2.0",
+            "generated_at": (generated_at or datetime.now(timezone.utc)).isoformat(timespec='seconds'),
+            "section_count": len(sections)
+        }
+        return report
+    
+    def _build_sections(self, wanted: Optional[FrozenSet[int]] = None) -> List[Dict[str, Any]]:
+        """Build all sections, or only the section numbers in `wanted`."""
+        return [
+            {"section_number": number, "section_title": title, "content": build(self)}
+            for number, title, build in self._SECTION_BUILDERS
+            if wanted is None or number in wanted
         ]
+    
+    def _buckets(self) -> Dict[str, List[str]]:
+        """Coach recommendations by category, classified once and shared by section 7 and JSON."""
+        if self._rec_buckets is None:
+            self._rec_buckets = _classify_recs(self._gr.coach_recs)
+        return self._rec_buckets
+    
+    def _resolved(self) -> _Resolved:
+        """Derived values shared by sections and the JSON object, computed once."""
+        if self._res is None:
+            self._res = _Resolved(
+                mode=self._detect_mode(),
+                perf_level=self.benchmark.get('performance_level') or self._gr.perf_level or _NA,
+                weekly_schedule=self.training_program.get('weekly_schedule') or {}
+            )
+        return self._res
+    
+    def _detect_mode(self) -> str:
+        """Training mode from existing flag, else GK/FIELD from position."""
+        mode = self.training_program.get('mode') or self.user.get('training_mode')
+        if mode:
+            return mode
+        return "GK" if _GK_RE.search(self._identity["position"] or "") else "FIELD"
+    
+    def json_object_bytes(self) -> bytes:
+        """
+        Serialized report_json.
         
-        # Build JSON object
-        report_json = self._build_json_object()
+        Reuses the bytes stored on the cached report when there is one, so
+        repeat renders of the same inputs skip serialization entirely.
+        """
+        cached = _report_cache.get(self.fingerprint())
+        if cached is None:
+            return dumps_report(self._build_json_object())
+        if cached.json_bytes is None:
+            cached.json_bytes = dumps_report(cached.report_json)
+        return cached.json_bytes
+    
+    def embed_json_fragment(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Swap report['report_json'] for its pre-serialized orjson.Fragment.
         
-        return {
-            "report_sections": sections,
-            "report_json": report_json,
-            "meta": {
-                "report_version": "2.0",
-                "generated_at": datetime.now(timezone.utc).isoformat(),
-                "section_count": len(sections)
-            }
-        }
+        Only applies when report_json came from the report cache (otherwise
+        it is serialized once either way), and is a no-op without
+        orjson >= 3.9. Call after any validation that needs report_json as
+        a dict.
+        """
+        if not JSON_FRAGMENTS_AVAILABLE or "report_json" not in report:
+            return report
+        cached = _report_cache.get(self.fingerprint())
+        if cached is not None and cached.report_json is report["report_json"]:
+            report["report_json"] = orjson.Fragment(self.json_object_bytes())
+        return report
+    
+    def to_json_bytes(self) -> bytes:
+        """Generate the report and serialize it to JSON bytes."""
+        return dumps_report(self.embed_json_fragment(self.generate_report()))
     
     # =========================================================================
     # SECTION 1: IDENTITY & BIOLOGY
@@ -139,35 +471,8 @@ class YoYoReportV2Formatter:
     def _section_1_identity_biology(self) -> Dict[str, Any]:
         """Section 1: Player identity and biological data."""
         return {
-            "section_number": 1,
-            "section_title": SECTION_TITLES[0],
-            "content": {
-                "player_name": (
-                    self.assessment.get('player_name') or 
-                    self.user.get('full_name') or 
-                    self.user.get('username') or 
-                    "N/A"
-                ),
-                "age": self.assessment.get('age') or self.user.get('age') or "N/A",
-                "gender": (
-                    self.assessment.get('gender') or 
-                    self.user.get('gender') or 
-                    "N/A"
-                ),
-                "position": (
-                    self.assessment.get('position') or 
-                    self.user.get('position') or 
-                    "N/A"
-                ),
-                "dominant_leg": (
-                    self.assessment.get('dominant_foot') or
-                    self.user.get('dominant_foot') or
-                    "N/A"
-                ),
-                "height_cm": self.assessment.get('height_cm') or self.user.get('height_cm') or "N/A",
-                "weight_kg": self.assessment.get('weight_kg') or self.user.get('weight_kg') or "N/A",
-                "assessment_date": self.assessment.get('assessment_date') or "N/A"
-            }
+            **{field: value or _NA for field, value in self._identity.items()},
+            "assessment_date": self.assessment.get('assessment_date') or _NA
         }
     
     # =========================================================================
@@ -175,92 +480,27 @@ class YoYoReportV2Formatter:
     # =========================================================================
     def _section_2_performance_snapshot(self) -> Dict[str, Any]:
         """Section 2: Current performance metrics with existing classifications."""
+        assessment = self.assessment
         # Use benchmark or assessment data
         overall_score = (
             self.benchmark.get('overall_score') or 
-            self.assessment.get('overall_score') or 
-            "N/A"
-        )
-        performance_level = (
-            self.benchmark.get('performance_level') or 
-            _safe_get(self.generated_report, 'scores', 'performance_level') or
-            "N/A"
+            assessment.get('overall_score') or 
+            _NA
         )
+        performance_level = self._resolved().perf_level
+        # Pull all metric values in one C-level pass (map over the bound
+        # dict.get) rather than a Python-level .get() per key
+        values = dict(zip(_METRIC_KEYS, map(assessment.get, _METRIC_KEYS)))
         
         return {
-            "section_number": 2,
-            "section_title": SECTION_TITLES[1],
-            "content": {
-                "overall_score": overall_score,
-                "performance_level": performance_level,
-                "physical_metrics": {
-                    "sprint_30m": {
-                        "value": self.assessment.get('sprint_30m') or "N/A",
-                        "label": "30m Sprint Time (seconds)"
-                    },
-                    "yo_yo_test": {
-                        "value": self.assessment.get('yo_yo_test') or "N/A",
-                        "label": "Yo-Yo IR Test (meters)"
-                    },
-                    "vo2_max": {
-                        "value": self.assessment.get('vo2_max') or "N/A",
-                        "label": "VO2 Max (ml/kg/min)"
-                    },
-                    "vertical_jump": {
-                        "value": self.assessment.get('vertical_jump') or "N/A",
-                        "label": "Vertical Jump (cm)"
-                    },
-                    "body_fat": {
-                        "value": self.assessment.get('body_fat') or "N/A",
-                        "label": "Body Fat (%)"
-                    }
-                },
-                "technical_metrics": {
-                    "ball_control": {
-                        "value": self.assessment.get('ball_control') or "N/A",
-                        "label": "Ball Control (1-5)"
-                    },
-                    "passing_accuracy": {
-                        "value": self.assessment.get('passing_accuracy') or "N/A",
-                        "label": "Passing Accuracy (%)"
-                    },
-                    "dribbling_success": {
-                        "value": self.assessment.get('dribbling_success') or "N/A",
-                        "label": "Dribbling Success (%)"
-                    },
-                    "shooting_accuracy": {
-                        "value": self.assessment.get('shooting_accuracy') or "N/A",
-                        "label": "Shooting Accuracy (%)"
-                    },
-                    "defensive_duels": {
-                        "value": self.assessment.get('defensive_duels') or "N/A",
-                        "label": "Defensive Duels Won (%)"
-                    }
-                },
-                "tactical_metrics": {
-                    "game_intelligence": {
-                        "value": self.assessment.get('game_intelligence') or "N/A",
-                        "label": "Game Intelligence (1-5)"
-                    },
-                    "positioning": {
-                        "value": self.assessment.get('positioning') or "N/A",
-                        "label": "Positioning (1-5)"
-                    },
-                    "decision_making": {
-                        "value": self.assessment.get('decision_making') or "N/A",
-                        "label": "Decision Making (1-5)"
-                    }
-                },
-                "psychological_metrics": {
-                    "coachability": {
-                        "value": self.assessment.get('coachability') or "N/A",
-                        "label": "Coachability (1-5)"
-                    },
-                    "mental_toughness": {
-                        "value": self.assessment.get('mental_toughness') or "N/A",
-                        "label": "Mental Toughness (1-5)"
-                    }
+            "overall_score": overall_score,
+            "performance_level": performance_level,
+            **{
+                group: {
+                    key: {"value": values[key] or _NA, "label": label}
+                    for key, label in metrics
                 }
+                for group, metrics in _METRIC_GROUPS
             }
         }
     
@@ -271,23 +511,19 @@ class YoYoReportV2Formatter:
         """Section 3: Identified strengths and weaknesses from existing outputs."""
         # Try to get from generated report first, then from benchmark
         strengths = (
-            _safe_get(self.generated_report, 'strengths') or
+            self._gr.strengths or
             self.benchmark.get('strengths') or
             []
         )
         weaknesses = (
-            _safe_get(self.generated_report, 'weaknesses') or
+            self._gr.weaknesses or
             self.benchmark.get('weaknesses') or
             []
         )
         
         return {
-            "section_number": 3,
-            "section_title": SECTION_TITLES[2],
-            "content": {
-                "strengths": strengths if strengths else ["N/A"],
-                "weaknesses": weaknesses if weaknesses else ["N/A"]
-            }
+            "strengths": strengths if strengths else [_NA],
+            "weaknesses": weaknesses if weaknesses else [_NA]
         }
     
     # =========================================================================
@@ -296,34 +532,26 @@ class YoYoReportV2Formatter:
     def _section_4_development_identity(self) -> Dict[str, Any]:
         """Section 4: Player's development profile from existing labels."""
         # Use existing labels/profile if present
-        performance_level = (
-            self.benchmark.get('performance_level') or
-            _safe_get(self.generated_report, 'scores', 'performance_level') or
-            "N/A"
-        )
+        performance_level = self._resolved().perf_level
         
         # Get AI analysis if available
-        ai_analysis = _safe_get(self.generated_report, 'ai_analysis') or ""
+        ai_analysis = self._gr.ai_analysis
         
         # Get strengths/weaknesses for summary derivation
-        strengths = _safe_get(self.generated_report, 'strengths') or []
-        weaknesses = _safe_get(self.generated_report, 'weaknesses') or []
+        strengths = self._gr.strengths
+        weaknesses = self._gr.weaknesses
         
         # Derive short summary if no existing profile label
-        profile_summary = "N/A"
+        profile_summary = _NA
         if ai_analysis:
             profile_summary = ai_analysis[:500] + "..." if len(ai_analysis) > 500 else ai_analysis
         elif strengths or weaknesses:
-            profile_summary = f"Strengths: {', '.join(strengths[:2]) if strengths else 'N/A'}. Areas to develop: {', '.join(weaknesses[:2]) if weaknesses else 'N/A'}."
+            profile_summary = f"Strengths: {', '.join(strengths[:2]) if strengths else _NA}. Areas to develop: {', '.join(weaknesses[:2]) if weaknesses else _NA}."
         
         return {
-            "section_number": 4,
-            "section_title": SECTION_TITLES[3],
-            "content": {
-                "performance_level": performance_level,
-                "profile_label": self.benchmark.get('profile_label') or performance_level,
-                "development_summary": profile_summary
-            }
+            "performance_level": performance_level,
+            "profile_label": self.benchmark.get('profile_label') or performance_level,
+            "development_summary": profile_summary
         }
     
     # =========================================================================
@@ -335,22 +563,18 @@ class YoYoReportV2Formatter:
         # Do NOT create new norms
         
         # Check for standards comparison in generated report
-        standards_comparison = _safe_get(self.generated_report, 'standards_comparison') or {}
+        standards_comparison = self._gr.standards
         
         return {
-            "section_number": 5,
-            "section_title": SECTION_TITLES[4],
-            "content": {
-                "note": "Only displays benchmarks already computed/stored by backend",
-                "existing_benchmarks": {
-                    "overall_score": {
-                        "now": self.assessment.get('overall_score') or "N/A",
-                        "target": self.benchmark.get('target_score') or "N/A",
-                        "elite": self.benchmark.get('elite_score') or "N/A"
-                    }
-                },
-                "standards_comparison": standards_comparison if standards_comparison else "N/A"
-            }
+            "note": "Only displays benchmarks already computed/stored by backend",
+            "existing_benchmarks": {
+                "overall_score": {
+                    "now": self.assessment.get('overall_score') or _NA,
+                    "target": self.benchmark.get('target_score') or _NA,
+                    "elite": self.benchmark.get('elite_score') or _NA
+                }
+            },
+            "standards_comparison": standards_comparison if standards_comparison else _NA
         }
     
     # =========================================================================
@@ -358,29 +582,11 @@ class YoYoReportV2Formatter:
     # =========================================================================
     def _section_6_training_mode(self) -> Dict[str, Any]:
         """Section 6: Training mode (FIELD or GK) based on position or mode flag."""
-        position = (
-            self.assessment.get('position') or 
-            self.user.get('position') or 
-            ""
-        ).lower()
-        
-        # Determine mode from position or existing flag
-        mode = self.training_program.get('mode') or self.user.get('training_mode')
-        if not mode:
-            # Check for goalkeeper position variants
-            gk_keywords = ["goalkeeper", "gk", "keeper", "goalie", "portero", "gardien"]
-            if any(kw in position for kw in gk_keywords):
-                mode = "GK"
-            else:
-                mode = "FIELD"
+        mode = self._resolved().mode
         
         return {
-            "section_number": 6,
-            "section_title": SECTION_TITLES[5],
-            "content": {
-                "mode": mode,
-                "position": self.assessment.get('position') or "N/A"
-            }
+            "mode": mode,
+            "position": self.assessment.get('position') or _NA
         }
     
     # =========================================================================
@@ -389,67 +595,64 @@ class YoYoReportV2Formatter:
     def _section_7_training_program(self) -> Dict[str, Any]:
         """Section 7: Training program with required sub-sections."""
         # Get existing recommendations if available
-        coach_recommendations = _safe_get(self.generated_report, 'coach_recommendations') or []
-        development_roadmap = _safe_get(self.generated_report, 'development_roadmap') or {}
+        coach_recommendations = self._gr.coach_recs
+        development_roadmap = self._gr.roadmap
         
         # Extract from training program if exists
         program_content = self.training_program.get('program_content') or ""
-        weekly_schedule = self.training_program.get('weekly_schedule') or {}
+        weekly_schedule = self._resolved().weekly_schedule
+        
+        buckets = self._buckets()
         
         return {
-            "section_number": 7,
-            "section_title": SECTION_TITLES[6],
-            "content": {
-                "7.1_technical": coach_recommendations[:2] if len(coach_recommendations) >= 2 else ["N/A"],
-                "7.2_tactical": [r for r in coach_recommendations if 'tactical' in r.lower() or 'position' in r.lower()] or ["N/A"],
-                "7.3_possession": [r for r in coach_recommendations if 'pass' in r.lower() or 'possess' in r.lower()] or ["N/A"],
-                "7.4_athletic_speed_agility": [r for r in coach_recommendations if 'speed' in r.lower() or 'agil' in r.lower() or 'sprint' in r.lower()] or ["N/A"],
-                "7.5_cardio": [r for r in coach_recommendations if 'cardio' in r.lower() or 'endurance' in r.lower() or 'aerobic' in r.lower()] or ["N/A"],
-                "7.6_gym_strength": [r for r in coach_recommendations if 'strength' in r.lower() or 'gym' in r.lower() or 'weight' in r.lower()] or ["N/A"],
-                "7.7_mobility_flexibility": [r for r in coach_recommendations if 'flex' in r.lower() or 'mobil' in r.lower() or 'stretch' in r.lower()] or ["N/A"],
-                "7.8_recovery_regeneration": [r for r in coach_recommendations if 'recovery' in r.lower() or 'rest' in r.lower()] or ["N/A"],
-                "7.9_injury_prevention_prehab": [r for r in coach_recommendations if 'injury' in r.lower() or 'prevent' in r.lower() or 'prehab' in r.lower()] or ["N/A"],
-                "weekly_schedule": weekly_schedule if weekly_schedule else "N/A",
-                "development_phases": development_roadmap if development_roadmap else "N/A"
-            }
+            "7.1_technical": coach_recommendations[:2] if len(coach_recommendations) >= 2 else [_NA],
+            "7.2_tactical": buckets["tactical"] or [_NA],
+            "7.3_possession": buckets["possession"] or [_NA],
+            "7.4_athletic_speed_agility": buckets["speed_agility"] or [_NA],
+            "7.5_cardio": buckets["cardio"] or [_NA],
+            "7.6_gym_strength": buckets["gym"] or [_NA],
+            "7.7_mobility_flexibility": buckets["mobility"] or [_NA],
+            "7.8_recovery_regeneration": buckets["recovery"] or [_NA],
+            "7.9_injury_prevention_prehab": buckets["prehab"] or [_NA],
+            "weekly_schedule": weekly_schedule if weekly_schedule else _NA,
+            "development_phases": development_roadmap if development_roadmap else _NA
         }
     
     # =========================================================================
     # SECTION 8: RETURN-TO-PLAY ENGINE
     # =========================================================================
-    def _section_8_return_to_play(self) -> Dict[str, Any]:
+    def _section_8_return_to_play(self) -> Union[Dict[str, Any], str]:
         """Section 8: Return-to-play guidelines (only if injury exists)."""
-        # Check for existing injury data
-        current_injuries = (
-            self.injury_data.get('current_injuries') or
-            self.assessment.get('current_injuries') or
-            self.user.get('current_injuries')
+        # Check for existing injury data (first source with a real value;
+        # placeholders like 'None' mean no injury)
+        current_injuries = next(
+            (
+                value for value in (
+                    self.injury_data.get('current_injuries'),
+                    self.assessment.get('current_injuries'),
+                    self.user.get('current_injuries')
+                )
+                if _has_injury(value)
+            ),
+            None
         )
         
-        if not current_injuries:
-            return {
-                "section_number": 8,
-                "section_title": SECTION_TITLES[7],
-                "content": "N/A"
-            }
+        if current_injuries is None:
+            return _NA
         
         # Only display existing injury-related data
         return {
-            "section_number": 8,
-            "section_title": SECTION_TITLES[7],
-            "content": {
-                "injury_status": current_injuries,
-                "rtp_stage": self.injury_data.get('rtp_stage') or "N/A",
-                "clearance_status": self.injury_data.get('clearance_status') or "Requires medical clearance",
-                "restrictions": self.injury_data.get('restrictions') or ["Consult medical staff"],
-                "note": "Data from existing injury records only"
-            }
+            "injury_status": current_injuries,
+            "rtp_stage": self.injury_data.get('rtp_stage') or _NA,
+            "clearance_status": self.injury_data.get('clearance_status') or "Requires medical clearance",
+            "restrictions": self.injury_data.get('restrictions') or ["Consult medical staff"],
+            "note": "Data from existing injury records only"
         }
     
     # =========================================================================
     # SECTION 9: SAFETY GOVERNOR
     # =========================================================================
-    def _section_9_safety_governor(self) -> Dict[str, Any]:
+    def _section_9_safety_governor(self) -> Union[Dict[str, Any], str]:
         """Section 9: Existing safety rules only - no new rules created."""
         # Only use safety rules already stored in the system
         existing_safety_rules = (
@@ -459,19 +662,11 @@ class YoYoReportV2Formatter:
         )
         
         if not existing_safety_rules:
-            return {
-                "section_number": 9,
-                "section_title": SECTION_TITLES[8],
-                "content": "N/A"
-            }
+            return _NA
         
         return {
-            "section_number": 9,
-            "section_title": SECTION_TITLES[8],
-            "content": {
-                "safety_rules": existing_safety_rules,
-                "note": "Existing safety rules only - no new rules generated"
-            }
+            "safety_rules": existing_safety_rules,
+            "note": "Existing safety rules only - no new rules generated"
         }
     
     # =========================================================================
@@ -480,47 +675,58 @@ class YoYoReportV2Formatter:
     def _section_10_ai_object(self) -> Dict[str, Any]:
         """Section 10: Machine-readable JSON object (see report_json)."""
         return {
-            "section_number": 10,
-            "section_title": SECTION_TITLES[9],
-            "content": {
-                "note": "Complete JSON object available in 'report_json' field at root level",
-                "preview": {
-                    "player_id": self.user.get('id') or self.assessment.get('user_id') or "",
-                    "name": self.assessment.get('player_name') or self.user.get('full_name') or ""
-                }
+            "note": "Complete JSON object available in 'report_json' field at root level",
+            "preview": {
+                "player_id": self.user.get('id') or self.assessment.get('user_id') or "",
+                "name": self._identity["player_name"] or ""
             }
         }
     
     # =========================================================================
     # SECTION 11: GOAL STATE
     # =========================================================================
-    def _section_11_goal_state(self) -> Dict[str, Any]:
+    def _section_11_goal_state(self) -> Union[Dict[str, Any], str]:
         """Section 11: Goals derived from existing plan targets."""
         # Get existing goals/targets
         goals = (
             self.training_program.get('goals') or
             self.training_program.get('milestones') or
-            _safe_get(self.generated_report, 'development_roadmap') or
+            self._gr.roadmap or
             {}
         )
         
         # Get end of cycle summary if exists
-        next_assessment = self.benchmark.get('next_assessment_date') or "N/A"
+        next_assessment = self.benchmark.get('next_assessment_date') or _NA
         
-        content = "N/A"
-        if goals or next_assessment != "N/A":
-            content = {
-                "goals": goals if goals else "N/A",
-                "next_assessment": next_assessment,
-                "end_of_cycle_summary": self.training_program.get('end_of_cycle_summary') or "Complete current training phase and reassess"
-            }
+        if not goals and next_assessment == _NA:
+            return _NA
         
         return {
-            "section_number": 11,
-            "section_title": SECTION_TITLES[10],
-            "content": content
+            "goals": goals if goals else _NA,
+            "next_assessment": next_assessment,
+            "end_of_cycle_summary": self.training_program.get('end_of_cycle_summary') or "Complete current training phase and reassess"
         }
     
+    # (section number, title, content builder) in FIXED ORDER. Builders are
+    # plain functions resolved once at class creation and return only the
+    # section content; _build_sections adds the number/title header.
+    _SECTION_BUILDERS = tuple(
+        (number, title, build)
+        for (number, title), build in zip(enumerate(SECTION_TITLES, start=1), (
+            _section_1_identity_biology,
+            _section_2_performance_snapshot,
+            _section_3_strengths_weaknesses,
+            _section_4_development_identity,
+            _section_5_benchmarks,
+            _section_6_training_mode,
+            _section_7_training_program,
+            _section_8_return_to_play,
+            _section_9_safety_governor,
+            _section_10_ai_object,
+            _section_11_goal_state
+        ))
+    )
+    
     # =========================================================================
     # JSON OBJECT BUILDER
     # =========================================================================
@@ -529,50 +735,49 @@ class YoYoReportV2Formatter:
         Build complete machine-readable JSON object.
         All keys MUST exist as per schema. Fill from existing data; if missing, use empty values.
         """
-        # Determine mode
-        position = (self.assessment.get('position') or self.user.get('position') or "").lower()
-        mode = self.training_program.get('mode') or self.user.get('training_mode')
-        if not mode:
-            gk_keywords = ["goalkeeper", "gk", "keeper", "goalie", "portero", "gardien"]
-            mode = "GK" if any(kw in position for kw in gk_keywords) else "FIELD"
-        
-        # Build sub_program from existing training data
-        existing_phases = _safe_get(self.generated_report, 'development_roadmap') or {}
-        weekly_schedule = self.training_program.get('weekly_schedule') or {}
-        coach_recs = _safe_get(self.generated_report, 'coach_recommendations') or []
+        # Bind inputs to locals so the single dict display below does plain
+        # local loads instead of repeated self.<attr> lookups
+        user, assessment, benchmark, program = (
+            self.user, self.assessment, self.benchmark, self.training_program
+        )
+        identity = self._identity
+        resolved = self._resolved()
+        gr = self._gr
+        buckets = self._buckets()
+        cardio, gym = buckets["cardio"], buckets["gym"]
         
         return {
-            "player_id": self.user.get('id') or self.assessment.get('user_id') or "",
-            "name": self.assessment.get('player_name') or self.user.get('full_name') or "",
-            "age": str(self.assessment.get('age') or self.user.get('age') or ""),
-            "gender": self.assessment.get('gender') or self.user.get('gender') or "",
-            "position": self.assessment.get('position') or self.user.get('position') or "",
-            "dominant_leg": self.assessment.get('dominant_foot') or self.user.get('dominant_foot') or "",
-            "mode": mode,
-            "profile_label": self.benchmark.get('performance_level') or "",
-            "weekly_sessions": str(self.training_program.get('weekly_sessions') or ""),
-            "total_weeks": str(self.training_program.get('total_weeks') or ""),
+            "player_id": user.get('id') or assessment.get('user_id') or "",
+            "name": identity["player_name"] or "",
+            "age": str(identity["age"] or ""),
+            "gender": identity["gender"] or "",
+            "position": identity["position"] or "",
+            "dominant_leg": identity["dominant_leg"] or "",
+            "mode": resolved.mode,
+            "profile_label": benchmark.get('performance_level') or "",
+            "weekly_sessions": str(program.get('weekly_sessions') or ""),
+            "total_weeks": str(program.get('total_weeks') or ""),
             "benchmarks": {
                 "overall_score": {
-                    "now": self.assessment.get('overall_score') or "",
-                    "target": self.benchmark.get('target_score') or "",
-                    "elite": self.benchmark.get('elite_score') or ""
+                    "now": assessment.get('overall_score') or "",
+                    "target": benchmark.get('target_score') or "",
+                    "elite": benchmark.get('elite_score') or ""
                 }
             },
-            "safety_rules": self.training_program.get('safety_rules') or self.user.get('safety_rules') or [],
+            "safety_rules": program.get('safety_rules') or user.get('safety_rules') or [],
             "sub_program": {
-                "phases": existing_phases if existing_phases else {},
-                "weekly_microcycle": weekly_schedule if weekly_schedule else {},
+                "phases": gr.roadmap or {},
+                "weekly_microcycle": resolved.weekly_schedule,
                 "expanded_sections": {
-                    "technical": [r for r in coach_recs if 'tech' in r.lower() or 'skill' in r.lower()] or [],
-                    "tactical": [r for r in coach_recs if 'tactical' in r.lower() or 'position' in r.lower()] or [],
-                    "possession": [r for r in coach_recs if 'pass' in r.lower() or 'possess' in r.lower()] or [],
-                    "cardio": {"recommendations": [r for r in coach_recs if 'cardio' in r.lower() or 'endurance' in r.lower()]} or {},
-                    "gym": {"recommendations": [r for r in coach_recs if 'strength' in r.lower() or 'gym' in r.lower()]} or {},
-                    "speed_agility": [r for r in coach_recs if 'speed' in r.lower() or 'agil' in r.lower()] or [],
-                    "mobility": [r for r in coach_recs if 'flex' in r.lower() or 'mobil' in r.lower()] or [],
-                    "recovery": [r for r in coach_recs if 'recovery' in r.lower() or 'rest' in r.lower()] or [],
-                    "prehab": [r for r in coach_recs if 'injury' in r.lower() or 'prehab' in r.lower()] or []
+                    "technical": buckets["technical"],
+                    "tactical": buckets["tactical"],
+                    "possession": buckets["possession"],
+                    "cardio": {"recommendations": cardio} if cardio else {},
+                    "gym": {"recommendations": gym} if gym else {},
+                    "speed_agility": buckets["speed_agility"],
+                    "mobility": buckets["mobility"],
+                    "recovery": buckets["recovery"],
+                    "prehab": buckets["prehab"]
                 }
             },
             "matches": [
@@ -581,7 +786,7 @@ class YoYoReportV2Formatter:
                     "opponent": m.get('opponent', ''),
                     "result": m.get('result', '')
                 } for m in self.match_history
-            ] if self.match_history else []
+            ]
         }
 
 
@@ -595,7 +800,10 @@ def format_yoyo_report_v2(
     training_program: Optional[Dict[str, Any]] = None,
     injury_data: Optional[Dict[str, Any]] = None,
     match_history: Optional[List[Dict[str, Any]]] = None,
-    generated_report: Optional[Dict[str, Any]] = None
+    generated_report: Optional[Dict[str, Any]] = None,
+    only: Optional[Iterable[int]] = None,
+    include_json: bool = True,
+    generated_at: Optional[datetime] = None
 ) -> Dict[str, Any]:
     """
     Convenience function to format existing data into YoYo Report v2.
@@ -608,6 +816,9 @@ def format_yoyo_report_v2(
         injury_data: Injury/medical data if exists
         match_history: Match history list
         generated_report: Previously generated AI report
+        only: Section numbers (1-11) to build; None builds all sections
+        include_json: Set False to skip building report_json
+        generated_at: Timestamp for meta; defaults to now (UTC)
     
     Returns:
         Complete YoYo Report v2 with 11 sections + JSON
@@ -621,7 +832,40 @@ def format_yoyo_report_v2(
         match_history=match_history,
         generated_report=generated_report
     )
-    return formatter.generate_report()
+    return formatter.generate_report(
+        only=only,
+        include_json=include_json,
+        generated_at=generated_at
+    )
+
+
+# Expected (section_number, section_title) pairs, in report order
+_EXPECTED_SECTIONS = tuple(enumerate(SECTION_TITLES, start=1))
+
+# Required keys are kept as ordered tuples so error messages stay stable;
+# the frozensets give a single C-level subset check on the happy path.
+_REQUIRED_JSON_KEY_ORDER = (
+    'player_id', 'name', 'age', 'gender', 'position', 'dominant_leg',
+    'mode', 'profile_label', 'weekly_sessions', 'total_weeks',
+    'benchmarks', 'safety_rules', 'sub_program', 'matches'
+)
+_REQUIRED_SUB_PROGRAM_KEY_ORDER = ('phases', 'weekly_microcycle', 'expanded_sections')
+_REQUIRED_EXPANDED_KEY_ORDER = (
+    'technical', 'tactical', 'possession', 'cardio', 'gym',
+    'speed_agility', 'mobility', 'recovery', 'prehab'
+)
+REQUIRED_JSON_KEYS = (frozenset(_REQUIRED_JSON_KEY_ORDER), _REQUIRED_JSON_KEY_ORDER)
+REQUIRED_SUB_PROGRAM_KEYS = (frozenset(_REQUIRED_SUB_PROGRAM_KEY_ORDER), _REQUIRED_SUB_PROGRAM_KEY_ORDER)
+REQUIRED_EXPANDED_KEYS = (frozenset(_REQUIRED_EXPANDED_KEY_ORDER), _REQUIRED_EXPANDED_KEY_ORDER)
+
+
+def _missing_keys(obj: Dict[str, Any], required: Tuple[FrozenSet[str], Tuple[str, ...]],
+                  message: str, errors: List[str]) -> None:
+    """Append one error per required key absent from obj, in declaration order."""
+    keys, ordered = required
+    if keys <= obj.keys():
+        return
+    errors.extend(f"{message}: {key}" for key in ordered if key not in obj)
 
 
 def validate_report_structure(report: Dict[str, Any]) -> Dict[str, Any]:
@@ -648,42 +892,26 @@ def validate_report_structure(report: Dict[str, Any]) -> Dict[str, Any]:
             errors.append(f"Expected 11 sections, got {len(sections)}")
         
         # Check section order
-        for i, section in enumerate(sections):
-            if section.get('section_number') != i + 1:
-                errors.append(f"Section {i+1} has wrong section_number: {section.get('section_number')}")
-            expected_title = SECTION_TITLES[i]
-            if section.get('section_title') != expected_title:
-                errors.append(f"Section {i+1} has wrong title. Expected '{expected_title}', got '{section.get('section_title')}'")
+        for (num, expected_title), section in zip(_EXPECTED_SECTIONS, sections):
+            g = section.get
+            if g('section_number') != num:
+                errors.append(f"Section {num} has wrong section_number: {g('section_number')}")
+            if g('section_title') != expected_title:
+                errors.append(f"Section {num} has wrong title. Expected '{expected_title}', got '{g('section_title')}'")
     
     # Check JSON object keys
     if 'report_json' in report:
         json_obj = report['report_json']
-        required_keys = [
-            'player_id', 'name', 'age', 'gender', 'position', 'dominant_leg',
-            'mode', 'profile_label', 'weekly_sessions', 'total_weeks',
-            'benchmarks', 'safety_rules', 'sub_program', 'matches'
-        ]
-        for key in required_keys:
-            if key not in json_obj:
-                errors.append(f"Missing required JSON key: {key}")
+        _missing_keys(json_obj, REQUIRED_JSON_KEYS, "Missing required JSON key", errors)
         
         # Check sub_program structure
         if 'sub_program' in json_obj:
             sub_program = json_obj['sub_program']
-            required_sub_keys = ['phases', 'weekly_microcycle', 'expanded_sections']
-            for key in required_sub_keys:
-                if key not in sub_program:
-                    errors.append(f"Missing sub_program key: {key}")
+            _missing_keys(sub_program, REQUIRED_SUB_PROGRAM_KEYS, "Missing sub_program key", errors)
             
             if 'expanded_sections' in sub_program:
-                expanded = sub_program['expanded_sections']
-                required_expanded = [
-                    'technical', 'tactical', 'possession', 'cardio', 'gym',
-                    'speed_agility', 'mobility', 'recovery', 'prehab'
-                ]
-                for key in required_expanded:
-                    if key not in expanded:
-                        errors.append(f"Missing expanded_sections key: {key}")
+                _missing_keys(sub_program['expanded_sections'], REQUIRED_EXPANDED_KEYS,
+                              "Missing expanded_sections key", errors)
     
     return {
         'valid': len(errors) == 0,
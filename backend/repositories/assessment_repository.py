@@ -1,13 +1,45 @@
 """Assessment repository for database operations."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Union, AsyncIterator
 from datetime import datetime, timezone
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, MAX_PAGE_SIZE, check_page_limit, ensure_index, fetch_parsed
 from utils.database import db, prepare_for_mongo, parse_from_mongo
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Default projection for latest-assessment lookups: the Mongo ObjectId is
+# never used by callers, so don't ship or decode it
+_LATEST_PROJECTION = {"_id": 0}
+
+# List reads never need the ObjectId either (and it isn't JSON-serializable
+# for routes that return documents directly)
+_LIST_PROJECTION = {"_id": 0}
+
+# Documents per server batch when streaming assessments (iter_all)
+ITER_BATCH_SIZE = 200
+
+
+# Keyset position: (created_at, id) of the last assessment on a page
+PageCursor = Tuple[Union[datetime, str], str]
+
+# List order: newest first, `id` breaks ties between equal created_at
+# values (stored with millisecond precision)
+_NEWEST_FIRST = [("created_at", -1), ("id", -1)]
+
+
+def _created_before(query: Dict[str, Any], after: Optional[PageCursor]) -> Dict[str, Any]:
+    """Add a keyset bound after `(created_at, id)` to a query sorted _NEWEST_FIRST."""
+    if after is None:
+        return query
+    created_at, last_id = after
+    # created_at is stored as an ISO string (prepare_for_mongo)
+    bound = created_at.isoformat() if isinstance(created_at, datetime) else created_at
+    return {**query, "$or": [
+        {"created_at": {"$lt": bound}},
+        {"created_at": bound, "id": {"$lt": last_id}}
+    ]}
+
 
 class AssessmentRepository(BaseRepository):
     """Repository for assessment-related database operations."""
@@ -16,6 +48,29 @@ class AssessmentRepository(BaseRepository):
         super().__init__(db.assessments)
         self.users = db.users
     
+    @classmethod
+    async def ensure_indexes(cls) -> None:
+        """
+        Create the indexes backing per-user lookups (idempotent).
+        
+        - user_id / player_name / nothing, then created_at desc, id desc:
+          find_latest / counts and the keyset pages of find_by_user,
+          find_by_player_name and find_all walk the index in list order
+          (the created_at prefixes also serve init-mongo.js's queries)
+        - partial user_id index on baseline docs only: find_baseline
+        
+        Default index names are used, as in init-mongo.js; a conflict
+        skips only that index.
+        """
+        for prefix in ([("user_id", 1)], [("player_name", 1)], []):
+            await ensure_index(db.assessments, prefix + _NEWEST_FIRST)
+        await ensure_index(
+            db.assessments,
+            [("user_id", 1)],
+            name="user_id_baseline",
+            partialFilterExpression={"is_baseline": True}
+        )
+    
     # =========================================================================
     # ASSESSMENT CRUD
     # =========================================================================
@@ -32,24 +87,62 @@ class AssessmentRepository(BaseRepository):
         doc = await self.collection.find_one({"id": assessment_id})
         return parse_from_mongo(doc) if doc else None
     
-    async def find_all(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        """Find all assessments, sorted by created_at descending."""
-        cursor = self.collection.find().sort("created_at", -1).limit(limit)
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+    async def find_all(
+        self,
+        limit: int = MAX_PAGE_SIZE,
+        after: Optional[PageCursor] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find all assessments, sorted by created_at descending.
+        
+        Pass (created_at, id) of the last assessment on the previous page as
+        `after` to fetch the next page (keyset pagination). `limit` above
+        MAX_PAGE_SIZE raises ValueError.
+        """
+        check_page_limit(limit)
+        cursor = self.collection.find(_created_before({}, after), _LIST_PROJECTION).sort(_NEWEST_FIRST).limit(limit)
+        return await fetch_parsed(cursor)
+    
+    async def iter_all(
+        self,
+        after: Optional[PageCursor] = None,
+        batch_size: int = ITER_BATCH_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream all assessments (created_at descending) one at a time.
+        
+        Unlike find_all there is no limit and no list is built: the cursor
+        fetches `batch_size` documents per round-trip, so exports and
+        streaming responses hold one batch in memory.
+        """
+        cursor = self.collection.find(
+            _created_before({}, after),
+            _LIST_PROJECTION,
+            batch_size=batch_size
+        ).sort(_NEWEST_FIRST)
+        async for doc in cursor:
+            yield parse_from_mongo(doc)
     
     async def find_by_player_name(
         self,
         player_name: str,
-        limit: int = 1000
+        limit: int = MAX_PAGE_SIZE,
+        after: Optional[PageCursor] = None
     ) -> List[Dict[str, Any]]:
-        """Find all assessments for a player, sorted by created_at descending."""
+        """
+        Find all assessments for a player, sorted by created_at descending.
+        
+        Pass (created_at, id) of the last assessment on the previous page as
+        `after` to fetch the next page (keyset pagination). `limit` above
+        MAX_PAGE_SIZE raises ValueError.
+        """
+        check_page_limit(limit)
         cursor = self.collection.find(
-            {"player_name": player_name}
-        ).sort("created_at", -1).limit(limit)
+            _created_before({"player_name": player_name}, after),
+            _LIST_PROJECTION
+        ).sort(_NEWEST_FIRST).limit(limit)
         
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+        return await fetch_parsed(cursor)
     
     async def find_latest_by_player_name(
         self,
@@ -98,21 +191,39 @@ class AssessmentRepository(BaseRepository):
     # LEGACY METHODS (for backward compatibility)
     # =========================================================================
     
-    async def find_by_user(self, user_id: str) -> List[Dict[str, Any]]:
-        """Find all assessments for a user by user_id."""
-        cursor = self.collection.find({"user_id": user_id}).sort("created_at", -1)
-        docs = await cursor.to_list(length=1000)
-        return [parse_from_mongo(doc) for doc in docs]
+    async def find_by_user(
+        self,
+        user_id: str,
+        limit: int = MAX_PAGE_SIZE,
+        after: Optional[PageCursor] = None
+    ) -> List[Dict[str, Any]]:
+        """Find assessments for a user by user_id (keyset-paged like find_all)."""
+        check_page_limit(limit)
+        cursor = self.collection.find(
+            _created_before({"user_id": user_id}, after),
+            _LIST_PROJECTION
+        ).sort(_NEWEST_FIRST).limit(limit)
+        return await fetch_parsed(cursor)
     
     async def find_baseline(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Find baseline assessment for a user."""
         doc = await self.collection.find_one({"user_id": user_id, "is_baseline": True})
         return parse_from_mongo(doc) if doc else None
     
-    async def find_latest(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Find latest assessment for a user by user_id."""
+    async def find_latest(
+        self,
+        user_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find latest assessment for a user by user_id.
+        
+        Single find_one round-trip. Pass `projection` to fetch only the
+        fields the caller consumes (defaults to everything except _id).
+        """
         doc = await self.collection.find_one(
             {"user_id": user_id},
+            projection or _LATEST_PROJECTION,
             sort=[("created_at", -1)]
         )
         return parse_from_mongo(doc) if doc else None
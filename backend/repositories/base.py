@@ -2,9 +2,63 @@
 
 from typing import Optional, List, Dict, Any
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure
 from utils.database import prepare_for_mongo, parse_from_mongo
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single page from any list read; callers needing more
+# page with `after` (keyset) or stream with iter_all
+MAX_PAGE_SIZE = 1000
+
+
+def check_page_limit(limit: int) -> int:
+    """Return `limit` if it is a valid page size, else raise ValueError."""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}, got {limit}")
+    return limit
+
+
+async def ensure_index(collection: AsyncIOMotorCollection, keys: Any, **kwargs: Any) -> bool:
+    """
+    create_index for ensure_indexes hooks: a conflict with an existing index
+    (e.g. the same keys under another name or options, as created by
+    init-mongo.js) is logged and skipped instead of aborting the hook, so
+    the remaining indexes are still built.
+    
+    Returns:
+        True if the index exists as requested afterwards
+    """
+    try:
+        await collection.create_index(keys, **kwargs)
+        return True
+    except OperationFailure as e:
+        logger.warning(f"Skipping index {keys!r} on {collection.name}: {e}")
+        return False
+
+# Documents per server batch for fetch_parsed
+FETCH_BATCH_SIZE = 500
+
+
+async def insert_prepared(collection: AsyncIOMotorCollection, docs: List[Dict[str, Any]]) -> None:
+    """
+    Insert prepare_for_mongo'd copies of `docs` with a single unordered
+    insert_many (one round-trip; one bad document doesn't stop the rest).
+    """
+    if docs:
+        await collection.insert_many([prepare_for_mongo(doc) for doc in docs], ordered=False)
+
+
+async def fetch_parsed(cursor: Any, batch_size: int = FETCH_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """
+    Drain a (limited) cursor, running parse_from_mongo on each document as
+    it arrives instead of building a raw list and parsing it afterwards.
+    """
+    cursor.batch_size(batch_size)
+    return [parse_from_mongo(doc) async for doc in cursor]
+
 
 class BaseRepository:
     """Base repository with generic CRUD operations."""
@@ -21,6 +75,14 @@ class BaseRepository:
         await self.collection.insert_one(prepared_data)
         return data
     
+    async def create_many(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several documents in one round-trip (see insert_prepared)."""
+        for data in docs:
+            if 'id' not in data:
+                data['id'] = str(uuid.uuid4())
+        await insert_prepared(self.collection, docs)
+        return docs
+    
     async def find_by_id(self, id: str) -> Optional[Dict[str, Any]]:
         """Find document by ID."""
         doc = await self.collection.find_one({"id": id})
@@ -31,13 +93,20 @@ class BaseRepository:
         doc = await self.collection.find_one(query)
         return parse_from_mongo(doc) if doc else None
     
-    async def find_many(self, query: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Find multiple documents matching query."""
-        cursor = self.collection.find(query)
-        if limit:
-            cursor = cursor.limit(limit)
-        docs = await cursor.to_list(length=None)
-        return [parse_from_mongo(doc) for doc in docs]
+    async def find_many(
+        self,
+        query: Dict[str, Any],
+        limit: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find multiple documents matching query (at most MAX_PAGE_SIZE).
+        
+        Pass `projection` when the caller only reads some fields, so large
+        nested values are neither sent nor decoded.
+        """
+        limit = check_page_limit(limit or MAX_PAGE_SIZE)
+        return await fetch_parsed(self.collection.find(query, projection).limit(limit))
     
     async def update(self, id: str, data: Dict[str, Any]) -> bool:
         """Update document by ID."""
@@ -56,3 +125,7 @@ class BaseRepository:
     async def count(self, query: Dict[str, Any]) -> int:
         """Count documents matching query."""
         return await self.collection.count_documents(query)
+    
+    async def exists(self, query: Dict[str, Any]) -> bool:
+        """Check whether any document matches (stops at the first hit, unlike count)."""
+        return await self.collection.find_one(query, {"_id": 1}) is not None
@@ -6,13 +6,123 @@ Database access layer for drill operations.
 Handles MongoDB interactions for drill storage and retrieval.
 """
 
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
-from utils.database import get_database
+from typing import Optional, List, Dict, Any, AsyncIterator, Sequence
+from pymongo import UpdateOne, TEXT
+from utils.database import get_database, utcnow_iso
+from utils.cache import async_ttl_cache, invalidate
+from repositories.base import MAX_PAGE_SIZE, check_page_limit, ensure_index
+from functools import cached_property
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Origin marker stamped server-side on every drill read from the database
+DB_SOURCE = "database"
+
+# Query cache namespace for drill reads; cleared on every drill write
+DRILL_CACHE = "drill"
+DRILL_CACHE_TTL_SECONDS = 60.0
+
+# Max operations per bulk_write call (keeps each command well under 16MB)
+BULK_WRITE_BATCH_SIZE = 1000
+
+# Documents per server batch when streaming drills (iter_all)
+ITER_BATCH_SIZE = 200
+
+# Fields needed to render a drill summary card (pass as `fields=`)
+DRILL_CARD_FIELDS = ("drill_id", "name", "section", "intensity", "duration_min", "tags")
+
+# Constant filter fragments shared by every _drill_query call (never mutated)
+_AGE_MIN_UNSET = ({"age_min": {"$exists": False}}, {"age_min": None})
+_AGE_MAX_UNSET = ({"age_max": {"$exists": False}}, {"age_max": None})
+_ANY_POSITION = {"positions": "any"}
+
+# Fields written only when a drill is first inserted
+_INSERT_ONLY_FIELDS = ("created_at", "created_by")
+
+
+def _upsert_update(drill_data: Dict[str, Any], admin_id: Optional[str], now: str) -> Dict[str, Any]:
+    """
+    Update document for an upsert by drill_id.
+    
+    Payload fields and updated_at are always set; created_at/created_by are
+    only written on insert, so existing drills keep their originals.
+    """
+    set_fields = {k: v for k, v in drill_data.items() if k not in _INSERT_ONLY_FIELDS}
+    set_fields["updated_at"] = now
+    return {
+        "$set": set_fields,
+        "$setOnInsert": {"created_at": now, "created_by": admin_id}
+    }
+
+
+def _drill_query(
+    include_inactive: bool = False,
+    section: Optional[str] = None,
+    tag: Optional[str] = None,
+    age: Optional[int] = None,
+    position: Optional[str] = None,
+    after: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Match query for find_all / iter_all filters.
+    
+    Age and position conditions are separate $or clauses ANDed together,
+    so a drill must fit the age range and the position.
+    """
+    query: Dict[str, Any] = {}
+    
+    if not include_inactive:
+        query["is_active"] = True
+    
+    if after is not None:
+        query["drill_id"] = {"$gt": after}
+    
+    if section:
+        query["section"] = section
+    
+    if tag:
+        query["tags"] = tag
+    
+    clauses: List[Dict[str, Any]] = []
+    if age is not None:
+        clauses.append({"$or": [*_AGE_MIN_UNSET, {"age_min": {"$lte": age}}]})
+        clauses.append({"$or": [*_AGE_MAX_UNSET, {"age_max": {"$gte": age}}]})
+    if position:
+        clauses.append({"$or": [{"positions": position}, _ANY_POSITION]})
+    if clauses:
+        query["$and"] = clauses
+    
+    return query
+
+
+def _projection(fields: Optional[Sequence[str]]) -> Dict[str, int]:
+    """$project spec: only `fields` when given, and never the ObjectId."""
+    if not fields:
+        return {"_id": 0}
+    projection = dict.fromkeys(fields, 1)
+    projection["_id"] = 0
+    return projection
+
+
+def _page_stages(skip: int, limit: int) -> List[Dict[str, Any]]:
+    """$facet branch for one page of drills in drill_id order."""
+    check_page_limit(limit)
+    stages: List[Dict[str, Any]] = [{"$sort": {"drill_id": 1}}]
+    if skip:
+        stages.append({"$skip": skip})
+    stages.append({"$limit": limit})
+    stages.append({"$project": {"_id": 0}})
+    stages.append({"$set": {"_source": DB_SOURCE}})
+    return stages
+
+
+def _facet_total(result: Dict[str, Any]) -> int:
+    """Read the `{"$count": "n"}` branch of a $facet result (absent when zero)."""
+    total = result.get("total") or [{"n": 0}]
+    return total[0]["n"]
+
 
 class DrillRepository:
     """Repository for drill database operations."""
@@ -20,18 +130,47 @@ class DrillRepository:
     def __init__(self):
         self._db = None
     
-    @property
+    @cached_property
     def db(self):
-        """Lazy load database connection."""
-        if self._db is None:
-            self._db = get_database()
-        return self._db
+        """Database handle, resolved once on first use (or the injected `_db`)."""
+        return self._db if self._db is not None else get_database()
     
-    @property
+    @cached_property
     def collection(self):
-        """Get drills collection."""
+        """Get drills collection (bound once per instance)."""
         return self.db.drills
     
+    async def ensure_indexes(self) -> None:
+        """
+        Create drill indexes (idempotent).
+        
+        - text index over name and tags: backs search_drills' $text query
+        - section / tags + is_active: find_by_section and find_all filters
+        - drill_id (unique): upsert lookups and find_all's keyset pagination
+          order; concurrent upserts can no longer create duplicates
+        
+        Each index is built independently, and the unique drill_id build
+        runs last: pre-existing duplicate drill_ids make only that build
+        fail (logged), leaving search and the filters indexed.
+        """
+        await ensure_index(
+            self.collection,
+            [("name", TEXT), ("tags", TEXT)],
+            name="drill_text",
+            weights={"name": 10, "tags": 1}
+        )
+        await ensure_index(
+            self.collection,
+            [("section", 1), ("is_active", 1)],
+            name="section_is_active"
+        )
+        await ensure_index(
+            self.collection,
+            [("tags", 1), ("is_active", 1)],
+            name="tags_is_active"
+        )
+        await ensure_index(self.collection, "drill_id", name="drill_id", unique=True)
+    
     async def upsert_drill(self, drill_data: Dict[str, Any], admin_id: Optional[str] = None) -> Dict[str, str]:
         """
         Insert or update a drill by drill_id.
@@ -40,70 +179,131 @@ class DrillRepository:
             Dict with 'action' ('inserted' or 'updated') and 'drill_id'
         """
         drill_id = drill_data['drill_id']
-        now = datetime.now(timezone.utc).isoformat()
-        
-        # Check if drill exists
-        existing = await self.collection.find_one({"drill_id": drill_id})
-        
-        if existing:
-            # Update existing drill
-            drill_data['updated_at'] = now
-            # Preserve original created_at and created_by
-            drill_data['created_at'] = existing.get('created_at', now)
-            drill_data['created_by'] = existing.get('created_by', admin_id)
-            
-            await self.collection.update_one(
-                {"drill_id": drill_id},
-                {"$set": drill_data}
-            )
-            logger.info(f"Updated drill: {drill_id}")
-            return {"action": "updated", "drill_id": drill_id}
-        else:
-            # Insert new drill
-            drill_data['created_at'] = now
-            drill_data['updated_at'] = now
-            drill_data['created_by'] = admin_id
-            
-            await self.collection.insert_one(drill_data)
+        now = utcnow_iso()
+        
+        # Single upsert: created_at/created_by are only written on insert,
+        # so existing drills keep their originals (no find-then-write race)
+        result = await self.collection.update_one(
+            {"drill_id": drill_id},
+            _upsert_update(drill_data, admin_id, now),
+            upsert=True
+        )
+        invalidate(DRILL_CACHE)
+        
+        if result.upserted_id is not None:
             logger.info(f"Inserted drill: {drill_id}")
             return {"action": "inserted", "drill_id": drill_id}
+        logger.info(f"Updated drill: {drill_id}")
+        return {"action": "updated", "drill_id": drill_id}
     
     async def upsert_many(self, drills: List[Dict[str, Any]], admin_id: Optional[str] = None) -> Dict[str, int]:
         """
-        Upsert multiple drills atomically.
+        Upsert multiple drills with bulk_write (one round-trip per batch).
+        
+        Batches are ordered so a drill_id repeated within one upload is
+        inserted once and then updated, as with sequential upserts.
         
         Returns:
             Dict with 'inserted' and 'updated' counts
         """
         inserted = 0
         updated = 0
+        now = utcnow_iso()
         
-        for drill_data in drills:
-            result = await self.upsert_drill(drill_data, admin_id)
-            if result['action'] == 'inserted':
-                inserted += 1
-            else:
-                updated += 1
+        ops = [
+            UpdateOne(
+                {"drill_id": drill_data["drill_id"]},
+                _upsert_update(drill_data, admin_id, now),
+                upsert=True
+            )
+            for drill_data in drills
+        ]
+        
+        for start in range(0, len(ops), BULK_WRITE_BATCH_SIZE):
+            result = await self.collection.bulk_write(
+                ops[start:start + BULK_WRITE_BATCH_SIZE],
+                ordered=True
+            )
+            inserted += result.upserted_count
+            updated += result.matched_count
+        
+        invalidate(DRILL_CACHE)
         
         logger.info(f"Upserted {len(drills)} drills: {inserted} inserted, {updated} updated")
         return {"inserted": inserted, "updated": updated}
     
-    async def find_by_id(self, drill_id: str) -> Optional[Dict[str, Any]]:
-        """Find a drill by its drill_id."""
-        doc = await self.collection.find_one(
+    async def _find_drills(
+        self,
+        query: Dict[str, Any],
+        skip: int = 0,
+        limit: int = MAX_PAGE_SIZE,
+        sort: Optional[Dict[str, int]] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a drill query with `_source` stamped by MongoDB.
+        
+        Equivalent to find(query, projection).sort(sort).skip(skip).limit(limit),
+        but each returned document already carries `_source: "database"` so
+        callers do not need to tag rows one by one. `fields` limits the
+        returned fields (all but _id by default).
+        """
+        check_page_limit(limit)
+        pipeline: List[Dict[str, Any]] = [{"$match": query}]
+        if sort:
+            pipeline.append({"$sort": sort})
+        if skip:
+            pipeline.append({"$skip": skip})
+        pipeline.append({"$limit": limit})
+        pipeline.append({"$project": _projection(fields)})
+        pipeline.append({"$set": {"_source": DB_SOURCE}})
+        cursor = self.collection.aggregate(pipeline)
+        return await cursor.to_list(length=limit)
+    
+    async def _iter_drills(
+        self,
+        query: Dict[str, Any],
+        sort: Optional[Dict[str, int]] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+        fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a drill query one document at a time (same stamping as
+        _find_drills), fetching `batch_size` documents per server batch
+        instead of materializing the whole result.
+        """
+        pipeline: List[Dict[str, Any]] = [{"$match": query}]
+        if sort:
+            pipeline.append({"$sort": sort})
+        pipeline.append({"$project": _projection(fields)})
+        pipeline.append({"$set": {"_source": DB_SOURCE}})
+        async for doc in self.collection.aggregate(pipeline, batchSize=batch_size):
+            yield doc
+    
+    @async_ttl_cache(DRILL_CACHE, ttl=DRILL_CACHE_TTL_SECONDS)
+    async def find_by_id(
+        self,
+        drill_id: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find a drill by its drill_id (optionally only `fields`)."""
+        docs = await self._find_drills(
             {"drill_id": drill_id, "is_active": True},
-            {"_id": 0}
+            limit=1,
+            fields=fields
         )
-        return doc
+        return docs[0] if docs else None
     
-    async def find_by_section(self, section: str) -> List[Dict[str, Any]]:
-        """Find all active drills in a section."""
-        cursor = self.collection.find(
-            {"section": section, "is_active": True},
-            {"_id": 0}
-        )
-        return await cursor.to_list(length=1000)
+    @async_ttl_cache(DRILL_CACHE, ttl=DRILL_CACHE_TTL_SECONDS)
+    async def find_by_section(
+        self,
+        section: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Find all active drills in a section (optionally only `fields`)."""
+        return await self._find_drills({"section": section, "is_active": True}, fields=fields)
     
+    @async_ttl_cache(DRILL_CACHE, ttl=DRILL_CACHE_TTL_SECONDS)
     async def find_all(
         self,
         include_inactive: bool = False,
@@ -112,57 +312,148 @@ class DrillRepository:
         age: Optional[int] = None,
         position: Optional[str] = None,
         skip: int = 0,
-        limit: int = 1000
+        limit: int = MAX_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Dict[str, Any]]:
-        """Find all drills with optional filters."""
-        query: Dict[str, Any] = {}
-        
-        if not include_inactive:
-            query["is_active"] = True
-        
-        if section:
-            query["section"] = section
-        
-        if tag:
-            query["tags"] = {"$in": [tag]}
+        """
+        Find all drills with optional filters, ordered by drill_id.
         
-        if age is not None:
-            query["$or"] = [
-                {"age_min": {"$exists": False}},
-                {"age_min": None},
-                {"age_min": {"$lte": age}}
-            ]
-            query["$and"] = [
-                {"$or": [
-                    {"age_max": {"$exists": False}},
-                    {"age_max": None},
-                    {"age_max": {"$gte": age}}
-                ]}
-            ]
+        Pass the last drill_id of the previous page as `after` for keyset
+        pagination (constant cost per page); `skip` remains for offset-based
+        page numbers. Pass `fields` (e.g. DRILL_CARD_FIELDS) to fetch only
+        what the caller renders; use a tuple so the result stays cacheable.
+        """
+        query = _drill_query(include_inactive, section, tag, age, position, after)
+        return await self._find_drills(
+            query, skip=skip, limit=limit, sort={"drill_id": 1}, fields=fields
+        )
+    
+    def iter_all(
+        self,
+        include_inactive: bool = False,
+        section: Optional[str] = None,
+        tag: Optional[str] = None,
+        age: Optional[int] = None,
+        position: Optional[str] = None,
+        after: Optional[str] = None,
+        batch_size: int = ITER_BATCH_SIZE,
+        fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every drill matching the find_all filters, ordered by drill_id.
         
-        if position:
-            query["$or"] = query.get("$or", []) + [
-                {"positions": {"$in": [position]}},
-                {"positions": {"$in": ["any"]}}
-            ]
+        For exports and streaming responses: memory stays at one server
+        batch regardless of library size. Not cached.
         
-        cursor = self.collection.find(query, {"_id": 0}).skip(skip).limit(limit)
-        return await cursor.to_list(length=limit)
+        Usage:
+            async for drill in repo.iter_all(section="technical"):
+                ...
+        """
+        query = _drill_query(include_inactive, section, tag, age, position, after)
+        return self._iter_drills(
+            query, sort={"drill_id": 1}, batch_size=batch_size, fields=fields
+        )
     
     async def count_drills(self, include_inactive: bool = False) -> int:
         """Count total drills in database."""
         query = {} if include_inactive else {"is_active": True}
         return await self.collection.count_documents(query)
     
+    async def count_all(
+        self,
+        include_inactive: bool = False,
+        section: Optional[str] = None,
+        tag: Optional[str] = None,
+        age: Optional[int] = None,
+        position: Optional[str] = None
+    ) -> int:
+        """Count drills matching the find_all filters (page totals)."""
+        query = _drill_query(include_inactive, section, tag, age, position)
+        return await self.collection.count_documents(query)
+    
+    @async_ttl_cache(DRILL_CACHE, ttl=DRILL_CACHE_TTL_SECONDS)
     async def count_by_section(self) -> Dict[str, int]:
         """Count drills grouped by section."""
         pipeline = [
             {"$match": {"is_active": True}},
-            {"$group": {"_id": "$section", "count": {"$sum": 1}}}
+            {"$group": {"_id": "$section", "count": {"$sum": 1}}},
+            # Drop drills without a section server-side
+            {"$match": {"_id": {"$nin": [None, ""]}}}
         ]
         cursor = self.collection.aggregate(pipeline)
-        results = await cursor.to_list(length=100)
-        return {item["_id"]: item["count"] for item in results if item["_id"]}
+        return {item["_id"]: item["count"] async for item in cursor}
+    
+    @async_ttl_cache(DRILL_CACHE, ttl=DRILL_CACHE_TTL_SECONDS)
+    async def page_with_stats(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Fetch a page of drills, the total match count and per-section counts
+        in one aggregation ($facet), instead of find_all + count_drills +
+        count_by_section.
+        
+        Cached like the other drill reads when called without `filters`
+        (e.g. the stats dashboard); a filters dict bypasses the cache.
+        
+        Args:
+            filters: Match query (defaults to active drills)
+            skip/limit: Page window over drill_id order; limit=0 skips the
+                rows and returns only the counts (max MAX_PAGE_SIZE)
+        
+        Returns:
+            Dict with 'rows', 'total' and 'by_section'
+        """
+        query = {"is_active": True} if filters is None else filters
+        facets: Dict[str, List[Dict[str, Any]]] = {
+            "total": [{"$count": "n"}],
+            "by_section": [
+                {"$group": {"_id": "$section", "count": {"$sum": 1}}},
+                {"$match": {"_id": {"$nin": [None, ""]}}}
+            ]
+        }
+        if limit:
+            facets["rows"] = _page_stages(skip, limit)
+        
+        result = await self._facet(query, facets)
+        return {
+            "rows": result.get("rows", []),
+            "total": _facet_total(result),
+            "by_section": {item["_id"]: item["count"] for item in result.get("by_section", [])}
+        }
+    
+    @async_ttl_cache(DRILL_CACHE, ttl=DRILL_CACHE_TTL_SECONDS)
+    async def find_page(
+        self,
+        section: Optional[str] = None,
+        tag: Optional[str] = None,
+        age: Optional[int] = None,
+        position: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Fetch one page of active drills and the total match count in a single
+        aggregation ($facet), so both share one match/index scan.
+        
+        Returns:
+            Dict with 'rows' (drill_id order) and 'total'
+        """
+        query = _drill_query(False, section, tag, age, position)
+        result = await self._facet(query, {
+            "rows": _page_stages(skip, limit),
+            "total": [{"$count": "n"}]
+        })
+        return {"rows": result.get("rows", []), "total": _facet_total(result)}
+    
+    async def _facet(self, query: Dict[str, Any], facets: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Run `$match query` + `$facet facets` and return the single result document."""
+        cursor = self.collection.aggregate([{"$match": query}, {"$facet": facets}])
+        results = await cursor.to_list(length=1)
+        return results[0] if results else {}
     
     async def delete_drill(self, drill_id: str, soft_delete: bool = True) -> bool:
         """
@@ -180,13 +471,16 @@ class DrillRepository:
                 {"drill_id": drill_id},
                 {"$set": {
                     "is_active": False,
-                    "updated_at": datetime.now(timezone.utc).isoformat()
+                    "updated_at": utcnow_iso()
                 }}
             )
-            return result.modified_count > 0
+            deleted = result.modified_count > 0
         else:
             result = await self.collection.delete_one({"drill_id": drill_id})
-            return result.deleted_count > 0
+            deleted = result.deleted_count > 0
+        
+        invalidate(DRILL_CACHE)
+        return deleted
     
     async def search_drills(
         self,
@@ -194,22 +488,33 @@ class DrillRepository:
         section: Optional[str] = None,
         intensity: Optional[str] = None,
         tags: Optional[List[str]] = None,
-        contraindications_exclude: Optional[List[str]] = None
+        contraindications_exclude: Optional[List[str]] = None,
+        partial: bool = False,
+        limit: int = MAX_PAGE_SIZE,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Dict[str, Any]]:
         """
         Search drills with various filters.
         
         Args:
-            query: Text search in name
+            query: Text search in name and tags (word/stem match via the
+                text index)
             section: Filter by section
             intensity: Filter by intensity
             tags: Filter by any of these tags
             contraindications_exclude: Exclude drills with these contraindications
+            partial: Match query as a literal, case-insensitive substring of
+                the name instead (no index; for prefix/fragment lookups)
+            limit: Max results (at most MAX_PAGE_SIZE)
+            fields: Only return these fields (all but _id by default)
         """
         filter_query: Dict[str, Any] = {"is_active": True}
         
         if query:
-            filter_query["name"] = {"$regex": query, "$options": "i"}
+            if partial:
+                filter_query["name"] = re.compile(re.escape(query), re.IGNORECASE)
+            else:
+                filter_query["$text"] = {"$search": query}
         
         if section:
             filter_query["section"] = section
@@ -223,8 +528,7 @@ class DrillRepository:
         if contraindications_exclude:
             filter_query["contraindications"] = {"$nin": contraindications_exclude}
         
-        cursor = self.collection.find(filter_query, {"_id": 0})
-        return await cursor.to_list(length=1000)
+        return await self._find_drills(filter_query, limit=limit, fields=fields)
 
 
 # Singleton instance
@@ -8,12 +8,22 @@ load monitoring, and match schedules.
 """
 
 from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
-from utils.database import get_database
+from pymongo.errors import CollectionInvalid, OperationFailure
+from utils.database import get_database, utcnow_iso
+from repositories.base import ensure_index
+from functools import cached_property
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-player daily series, stored as MongoDB time-series collections
+# (bucketed by player and time; `date` must be a datetime)
+TIMESERIES_COLLECTIONS = ("wellness_logs", "load_monitoring")
+TIMESERIES_OPTIONS = {"timeField": "date", "metaField": "player_name", "granularity": "hours"}
+
+# Server error code for create_collection on an existing collection
+NAMESPACE_EXISTS = 48
+
 
 class EliteTrainingRepository:
     """Repository for elite training database operations."""
@@ -21,12 +31,112 @@ class EliteTrainingRepository:
     def __init__(self):
         self._db = None
     
-    @property
+    @cached_property
     def db(self):
-        """Lazy load database connection."""
-        if self._db is None:
-            self._db = get_database()
-        return self._db
+        """Database handle, resolved once on first use (or the injected `_db`)."""
+        return self._db if self._db is not None else get_database()
+    
+    # Collection handles, bound once per instance: `db.<name>` builds a new
+    # collection object on every access
+    
+    @cached_property
+    def elite_training_plans(self):
+        return self.db.elite_training_plans
+    
+    @cached_property
+    def wellness_logs(self):
+        return self.db.wellness_logs
+    
+    @cached_property
+    def testing_data(self):
+        return self.db.testing_data
+    
+    @cached_property
+    def load_monitoring(self):
+        return self.db.load_monitoring
+    
+    @cached_property
+    def match_schedules(self):
+        return self.db.match_schedules
+    
+    async def ensure_collections(self) -> None:
+        """
+        Create the time-series collections if they don't exist yet.
+        
+        Existing (regular) collections are left as they are; converting
+        them requires a manual copy. Another worker creating the same
+        collection concurrently is not an error.
+        """
+        existing = set(await self.db.list_collection_names())
+        for name in TIMESERIES_COLLECTIONS:
+            if name in existing:
+                continue
+            try:
+                await self.db.create_collection(name, timeseries=TIMESERIES_OPTIONS)
+            except CollectionInvalid:
+                continue
+            except OperationFailure as e:
+                if e.code != NAMESPACE_EXISTS:
+                    raise
+                continue
+            logger.info(f"Created time-series collection: {name}")
+    
+    async def ensure_indexes(self) -> None:
+        """
+        Create the per-player indexes behind every lookup below (idempotent).
+        
+        Each "latest N for a player" read becomes an index walk instead of a
+        collection scan plus in-memory sort. match_schedules is unique on
+        player_name since upsert_match_schedule keys on it.
+        
+        Runs ensure_collections first, since creating an index would
+        otherwise create the time-series collections as regular ones.
+        """
+        await self.ensure_collections()
+        await ensure_index(
+            self.elite_training_plans,
+            [("player_name", 1), ("created_at", -1)],
+            name="player_name_created_at_desc"
+        )
+        await ensure_index(
+            self.wellness_logs,
+            [("player_name", 1), ("date", -1)],
+            name="player_name_date_desc"
+        )
+        await ensure_index(
+            self.load_monitoring,
+            [("player_name", 1), ("date", -1)],
+            name="player_name_date_desc"
+        )
+        await ensure_index(
+            self.testing_data,
+            [("player_name", 1), ("test_date", -1)],
+            name="player_name_test_date_desc"
+        )
+        await ensure_index(
+            self.match_schedules,
+            "player_name",
+            name="player_name",
+            unique=True
+        )
+    
+    async def _insert_many(
+        self,
+        collection,
+        docs: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Stamp `logged_at` and insert log entries in one unordered batch.
+        
+        Returns the inserted ids as strings, in input order.
+        """
+        if not docs:
+            return []
+        now = utcnow_iso()
+        for doc in docs:
+            doc["logged_at"] = now
+        result = await collection.insert_many(docs, ordered=False)
+        return [str(inserted_id) for inserted_id in result.inserted_ids]
     
     # =========================================================================
     # ELITE TRAINING PLANS
@@ -34,8 +144,8 @@ class EliteTrainingRepository:
     
     async def create_training_plan(self, plan_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new elite training plan."""
-        plan_data["created_at"] = datetime.now(timezone.utc).isoformat()
-        await self.db.elite_training_plans.insert_one(plan_data)
+        plan_data["created_at"] = utcnow_iso()
+        await self.elite_training_plans.insert_one(plan_data)
         logger.info(f"Elite training plan created for player: {plan_data.get('player_name')}")
         return plan_data
     
@@ -45,7 +155,7 @@ class EliteTrainingRepository:
         limit: int = 10
     ) -> List[Dict[str, Any]]:
         """Find recent training plans for a player."""
-        cursor = self.db.elite_training_plans.find(
+        cursor = self.elite_training_plans.find(
             {"player_name": player_name}
         ).sort("created_at", -1).limit(limit)
         return await cursor.to_list(length=limit)
@@ -56,9 +166,17 @@ class EliteTrainingRepository:
     
     async def create_wellness_log(self, wellness_data: Dict[str, Any]) -> str:
         """Create a new wellness log entry. Returns inserted_id as string."""
-        wellness_data["logged_at"] = datetime.now(timezone.utc).isoformat()
-        result = await self.db.wellness_logs.insert_one(wellness_data)
-        return str(result.inserted_id)
+        ids = await self._insert_many(self.wellness_logs, [wellness_data])
+        return ids[0]
+    
+    async def create_wellness_logs_bulk(self, logs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many wellness log entries (backfills, device sync) in one round-trip.
+        
+        Each log's `date` must be a datetime: the time-series collection
+        rejects string dates.
+        """
+        return await self._insert_many(self.wellness_logs, logs)
     
     async def find_wellness_logs_by_player(
         self, 
@@ -66,7 +184,7 @@ class EliteTrainingRepository:
         days: int = 7
     ) -> List[Dict[str, Any]]:
         """Find recent wellness logs for a player."""
-        cursor = self.db.wellness_logs.find(
+        cursor = self.wellness_logs.find(
             {"player_name": player_name}
         ).sort("date", -1).limit(days)
         return await cursor.to_list(length=days)
@@ -77,13 +195,12 @@ class EliteTrainingRepository:
     
     async def create_testing_data(self, testing_data: Dict[str, Any]) -> str:
         """Create a new testing data entry. Returns inserted_id as string."""
-        testing_data["logged_at"] = datetime.now(timezone.utc).isoformat()
-        result = await self.db.testing_data.insert_one(testing_data)
-        return str(result.inserted_id)
+        ids = await self._insert_many(self.testing_data, [testing_data])
+        return ids[0]
     
     async def find_latest_testing_data(self, player_name: str) -> Optional[Dict[str, Any]]:
         """Find the latest testing data for a player."""
-        return await self.db.testing_data.find_one(
+        return await self.testing_data.find_one(
             {"player_name": player_name},
             sort=[("test_date", -1)]
         )
@@ -94,9 +211,17 @@ class EliteTrainingRepository:
     
     async def create_load_log(self, load_data: Dict[str, Any]) -> str:
         """Create a new load monitoring entry. Returns inserted_id as string."""
-        load_data["logged_at"] = datetime.now(timezone.utc).isoformat()
-        result = await self.db.load_monitoring.insert_one(load_data)
-        return str(result.inserted_id)
+        ids = await self._insert_many(self.load_monitoring, [load_data])
+        return ids[0]
+    
+    async def create_load_logs_bulk(self, logs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many load monitoring entries in one round-trip.
+        
+        Each log's `date` must be a datetime: the time-series collection
+        rejects string dates.
+        """
+        return await self._insert_many(self.load_monitoring, logs)
     
     async def find_load_logs_by_player(
         self, 
@@ -104,7 +229,7 @@ class EliteTrainingRepository:
         days: int = 7
     ) -> List[Dict[str, Any]]:
         """Find recent load monitoring logs for a player."""
-        cursor = self.db.load_monitoring.find(
+        cursor = self.load_monitoring.find(
             {"player_name": player_name}
         ).sort("date", -1).limit(days)
         return await cursor.to_list(length=days)
@@ -119,8 +244,8 @@ class EliteTrainingRepository:
         schedule_data: Dict[str, Any]
     ) -> None:
         """Update or insert match schedule for a player."""
-        schedule_data["updated_at"] = datetime.now(timezone.utc).isoformat()
-        await self.db.match_schedules.update_one(
+        schedule_data["updated_at"] = utcnow_iso()
+        await self.match_schedules.update_one(
             {"player_name": player_name},
             {"$set": schedule_data},
             upsert=True
@@ -128,7 +253,7 @@ class EliteTrainingRepository:
     
     async def find_match_schedule(self, player_name: str) -> Optional[Dict[str, Any]]:
         """Find match schedule for a player."""
-        return await self.db.match_schedules.find_one({"player_name": player_name})
+        return await self.match_schedules.find_one({"player_name": player_name})
 
 
 # Singleton instance
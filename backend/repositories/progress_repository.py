@@ -2,12 +2,26 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, timedelta
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, ensure_index, fetch_parsed, insert_prepared
 from utils.database import db, prepare_for_mongo, parse_from_mongo
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Compound indexes backing the per-player reads (see ensure_indexes)
+DAILY_PROGRESS_INDEX = [("player_id", 1), ("date", -1)]
+PERFORMANCE_METRICS_INDEX = [("player_id", 1), ("measurement_date", -1)]
+
+# Field subsets for callers that only need assessment/program metadata
+# (assessments and programs carry large nested drill and cycle data)
+ASSESSMENT_SUMMARY_PROJECTION = {
+    "_id": 0, "id": 1, "created_at": 1, "overall_score": 1, "performance_level": 1
+}
+PROGRAM_SCHEDULE_PROJECTION = {
+    "_id": 0, "id": 1, "created_at": 1, "program_start_date": 1,
+    "next_assessment_date": 1, "macro_cycles.duration_weeks": 1
+}
+
 
 class ProgressRepository:
     """Repository for progress-related database operations."""
@@ -19,6 +33,19 @@ class ProgressRepository:
         self.assessments = db.assessments
         self.periodized_programs = db.periodized_programs
     
+    @classmethod
+    async def ensure_indexes(cls) -> None:
+        """
+        Create per-player indexes matching each read's sort (idempotent).
+        
+        Equality field first, sort field second in the same direction, so
+        "latest N for a player" reads walk the index with no sort stage.
+        Default names match init-mongo.js; a conflict skips only that index.
+        """
+        await ensure_index(db.daily_progress, DAILY_PROGRESS_INDEX)
+        await ensure_index(db.weekly_progress, [("player_id", 1), ("created_at", -1)])
+        await ensure_index(db.performance_metrics, PERFORMANCE_METRICS_INDEX)
+    
     # =========================================================================
     # DAILY PROGRESS
     # =========================================================================
@@ -46,8 +73,7 @@ class ProgressRepository:
             }
         ).sort("date", -1).limit(limit)
         
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+        return await fetch_parsed(cursor)
     
     async def find_recent_daily_progress(
         self,
@@ -59,8 +85,7 @@ class ProgressRepository:
             {"player_id": player_id}
         ).sort("date", -1).limit(limit)
         
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+        return await fetch_parsed(cursor)
     
     async def count_daily_progress(
         self,
@@ -69,6 +94,14 @@ class ProgressRepository:
     ) -> int:
         """Count daily progress entries for a player within a date range."""
         start_date = datetime.now(timezone.utc) - timedelta(days=days)
+        return await self.count_daily_progress_since(player_id, start_date)
+    
+    async def count_daily_progress_since(
+        self,
+        player_id: str,
+        start_date: datetime
+    ) -> int:
+        """Count a player's daily progress entries dated on/after `start_date`."""
         return await self.daily_progress.count_documents(
             {
                 "player_id": player_id,
@@ -97,8 +130,7 @@ class ProgressRepository:
             {"player_id": player_id}
         ).sort("created_at", -1).limit(limit)
         
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+        return await fetch_parsed(cursor)
     
     # =========================================================================
     # PERFORMANCE METRICS
@@ -110,6 +142,11 @@ class ProgressRepository:
         await self.performance_metrics.insert_one(prepared_data)
         return data
     
+    async def create_performance_metrics(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create several performance metric entries in one round-trip."""
+        await insert_prepared(self.performance_metrics, docs)
+        return docs
+    
     async def find_metrics_by_player(
         self,
         player_id: str,
@@ -120,25 +157,34 @@ class ProgressRepository:
             {"player_id": player_id}
         ).sort("measurement_date", -1).limit(limit)
         
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+        return await fetch_parsed(cursor)
     
     # =========================================================================
     # ASSESSMENTS & PROGRAMS
     # =========================================================================
     
-    async def find_latest_assessment(self, player_id: str) -> Optional[Dict[str, Any]]:
-        """Find the latest assessment for a player."""
+    async def find_latest_assessment(
+        self,
+        player_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find the latest assessment for a player (optionally only `projection` fields)."""
         doc = await self.assessments.find_one(
             {"player_name": player_id},
+            projection,
             sort=[("created_at", -1)]
         )
         return parse_from_mongo(doc) if doc else None
     
-    async def find_latest_program(self, player_id: str) -> Optional[Dict[str, Any]]:
-        """Find the latest periodized program for a player."""
+    async def find_latest_program(
+        self,
+        player_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Find the latest periodized program for a player (optionally only `projection` fields)."""
         doc = await self.periodized_programs.find_one(
             {"player_id": player_id},
+            projection,
             sort=[("created_at", -1)]
         )
         return parse_from_mongo(doc) if doc else None
@@ -1,9 +1,12 @@
 """Report repository for data access."""
 
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
 from .base import BaseRepository
 from utils.database import db
 
+# Fields needed to list saved reports without their (large) bodies
+REPORT_SUMMARY_PROJECTION = {"_id": 0, "id": 1, "report_type": 1, "title": 1, "created_at": 1, "saved_at": 1}
+
 
 class ReportRepository(BaseRepository):
     """Repository for saved reports data access."""
@@ -11,9 +14,19 @@ class ReportRepository(BaseRepository):
     def __init__(self):
         super().__init__(db.saved_reports)
     
-    async def find_by_user(self, user_id: str, limit: Optional[int] = None) -> List[dict]:
-        """Find all reports for a user."""
-        return await self.find_many({"user_id": user_id}, limit=limit)
+    async def find_by_user(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
+        """
+        Find all reports for a user.
+        
+        Pass REPORT_SUMMARY_PROJECTION for list views that don't render
+        report bodies.
+        """
+        return await self.find_many({"user_id": user_id}, limit=limit, projection=projection)
     
     async def find_by_type(self, user_id: str, report_type: str) -> List[dict]:
         """Find reports by type for a user."""
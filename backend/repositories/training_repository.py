@@ -8,13 +8,12 @@ Handles all MongoDB interactions for periodized programs and training programs.
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, MAX_PAGE_SIZE, check_page_limit, ensure_index, fetch_parsed
 from utils.database import db, prepare_for_mongo, parse_from_mongo
 import logging
 
 logger = logging.getLogger(__name__)
 
-
 class TrainingRepository(BaseRepository):
     """Repository for training-related database operations."""
     
@@ -23,6 +22,16 @@ class TrainingRepository(BaseRepository):
         self.periodized_programs = db.periodized_programs
         self.assessments = db.assessments
     
+    @classmethod
+    async def ensure_indexes(cls) -> None:
+        """
+        Index periodized and legacy programs by player and created_at desc
+        (idempotent); backs the latest-program find_one and the list reads.
+        Default names match init-mongo.js; a conflict skips only that index.
+        """
+        await ensure_index(db.periodized_programs, [("player_id", 1), ("created_at", -1)])
+        await ensure_index(db.training_programs, [("player_id", 1), ("created_at", -1)])
+    
     # =========================================================================
     # PERIODIZED PROGRAMS
     # =========================================================================
@@ -42,13 +51,17 @@ class TrainingRepository(BaseRepository):
         )
         return parse_from_mongo(doc) if doc else None
     
-    async def find_all_periodized_programs(self, player_id: str) -> List[Dict[str, Any]]:
-        """Find all periodized programs for a player."""
+    async def find_all_periodized_programs(
+        self,
+        player_id: str,
+        limit: int = MAX_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Find up to `limit` periodized programs for a player, newest first."""
+        check_page_limit(limit)
         cursor = self.periodized_programs.find(
             {"player_id": player_id}
-        ).sort("created_at", -1)
-        docs = await cursor.to_list(length=1000)
-        return [parse_from_mongo(doc) for doc in docs]
+        ).sort("created_at", -1).limit(limit)
+        return await fetch_parsed(cursor)
     
     # =========================================================================
     # TRAINING PROGRAMS (Legacy)
@@ -61,13 +74,17 @@ class TrainingRepository(BaseRepository):
         logger.info(f"Training program created for player: {program_data.get('player_id')}")
         return program_data
     
-    async def find_training_programs_by_player(self, player_id: str) -> List[Dict[str, Any]]:
-        """Find all training programs for a player."""
+    async def find_training_programs_by_player(
+        self,
+        player_id: str,
+        limit: int = MAX_PAGE_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Find up to `limit` training programs for a player, newest first."""
+        check_page_limit(limit)
         cursor = self.collection.find(
             {"player_id": player_id}
-        ).sort("created_at", -1)
-        docs = await cursor.to_list(length=1000)
-        return [parse_from_mongo(doc) for doc in docs]
+        ).sort("created_at", -1).limit(limit)
+        return await fetch_parsed(cursor)
     
     async def find_training_program_by_id(self, program_id: str) -> Optional[Dict[str, Any]]:
         """Find a training program by ID."""
@@ -1,9 +1,24 @@
 """User repository for data access."""
 
-from typing import Optional, List
-from .base import BaseRepository
+from typing import Optional, List, Dict, Any
+from .base import BaseRepository, ensure_index
 from utils.database import db
 
+# Fields _process_pending_invitations reads from an invitation
+_INVITATION_PROJECTION = {"_id": 0, "id": 1, "type": 1, "player_id": 1}
+
+# Relationship collection handles, built once per name (repositories are
+# constructed per service instance)
+_COLLECTIONS: Dict[str, Any] = {}
+
+
+def _collection(name: str):
+    """Return a cached handle for `name` on the shared database."""
+    collection = _COLLECTIONS.get(name)
+    if collection is None:
+        collection = _COLLECTIONS[name] = db[name]
+    return collection
+
 
 class UserRepository(BaseRepository):
     """Repository for user data access."""
@@ -11,6 +26,18 @@ class UserRepository(BaseRepository):
     def __init__(self):
         super().__init__(db.users)
     
+    @classmethod
+    async def ensure_indexes(cls) -> None:
+        """
+        Declare email and username unique (idempotent).
+        
+        Makes the is_*_taken checks single-key index probes and lets the
+        database reject duplicates that race past them. Default names
+        match init-mongo.js's unique email_1/username_1, so those are no-ops.
+        """
+        await ensure_index(db.users, "email", unique=True)
+        await ensure_index(db.users, "username", unique=True)
+    
     async def find_by_email(self, email: str) -> Optional[dict]:
         """Find user by email."""
         return await self.find_one({"email": email})
@@ -19,9 +46,14 @@ class UserRepository(BaseRepository):
         """Find user by username."""
         return await self.find_one({"username": username})
     
-    async def find_by_role(self, role: str, limit: Optional[int] = None) -> List[dict]:
-        """Find users by role."""
-        return await self.find_many({"role": role}, limit=limit)
+    async def find_by_role(
+        self,
+        role: str,
+        limit: Optional[int] = None,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
+        """Find users by role (optionally only the `projection` fields)."""
+        return await self.find_many({"role": role}, limit=limit, projection=projection)
     
     async def update_last_login(self, user_id: str, timestamp: str) -> bool:
         """Update user's last login timestamp."""
@@ -29,13 +61,11 @@ class UserRepository(BaseRepository):
     
     async def is_email_taken(self, email: str) -> bool:
         """Check if email is already registered."""
-        count = await self.count({"email": email})
-        return count > 0
+        return await self.exists({"email": email})
     
     async def is_username_taken(self, username: str) -> bool:
         """Check if username is already taken."""
-        count = await self.count({"username": username})
-        return count > 0
+        return await self.exists({"username": username})
 
 
 class UserProfileRepository(BaseRepository):
@@ -66,19 +96,31 @@ class RelationshipRepository(BaseRepository):
     """Repository for parent-player and coach-player relationships."""
     
     def __init__(self, collection_name: str):
-        super().__init__(getattr(db, collection_name))
+        super().__init__(_collection(collection_name))
     
-    async def find_by_player(self, player_id: str) -> List[dict]:
+    async def find_by_player(
+        self,
+        player_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
         """Find all relationships for a player."""
-        return await self.find_many({"player_id": player_id})
+        return await self.find_many({"player_id": player_id}, projection=projection)
     
-    async def find_by_parent(self, parent_id: str) -> List[dict]:
+    async def find_by_parent(
+        self,
+        parent_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
         """Find all relationships for a parent."""
-        return await self.find_many({"parent_id": parent_id})
+        return await self.find_many({"parent_id": parent_id}, projection=projection)
     
-    async def find_by_coach(self, coach_id: str) -> List[dict]:
+    async def find_by_coach(
+        self,
+        coach_id: str,
+        projection: Optional[Dict[str, Any]] = None
+    ) -> List[dict]:
         """Find all relationships for a coach."""
-        return await self.find_many({"coach_id": coach_id})
+        return await self.find_many({"coach_id": coach_id}, projection=projection)
 
 
 class InvitationRepository(BaseRepository):
@@ -88,8 +130,11 @@ class InvitationRepository(BaseRepository):
         super().__init__(db.pending_invitations)
     
     async def find_pending_by_email(self, email: str) -> List[dict]:
-        """Find pending invitations by email."""
-        return await self.find_many({"email": email, "status": "pending"})
+        """Find pending invitations by email (id, type and player_id only)."""
+        return await self.find_many(
+            {"email": email, "status": "pending"},
+            projection=_INVITATION_PROJECTION
+        )
     
     async def mark_as_processed(self, invitation_id: str) -> bool:
         """Mark invitation as processed."""
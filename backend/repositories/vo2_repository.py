@@ -1,12 +1,15 @@
 """VO2 Max repository for database operations."""
 
 from typing import Optional, List, Dict, Any
-from repositories.base import BaseRepository
+from repositories.base import BaseRepository, ensure_index, fetch_parsed
 from utils.database import db, prepare_for_mongo, parse_from_mongo
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-player index backing the benchmark history read
+BENCHMARK_INDEX = [("player_id", 1), ("test_date", -1)]
+
 
 class VO2Repository(BaseRepository):
     """Repository for VO2 Max benchmark database operations."""
@@ -14,6 +17,11 @@ class VO2Repository(BaseRepository):
     def __init__(self):
         super().__init__(db.vo2_benchmarks)
     
+    @classmethod
+    async def ensure_indexes(cls) -> None:
+        """Index benchmarks by player and test_date desc (idempotent; same name as init-mongo.js)."""
+        await ensure_index(db.vo2_benchmarks, BENCHMARK_INDEX)
+    
     async def create_benchmark(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new VO2 benchmark."""
         prepared_data = prepare_for_mongo(data)
@@ -31,8 +39,7 @@ class VO2Repository(BaseRepository):
             {"player_id": player_id}
         ).sort("test_date", -1).limit(limit)
         
-        docs = await cursor.to_list(length=limit)
-        return [parse_from_mongo(doc) for doc in docs]
+        return await fetch_parsed(cursor)
     
     async def find_latest_by_player_id(
         self, 
@@ -9,9 +9,12 @@ Requires JWT authentication with role="admin".
 from fastapi import APIRouter, HTTPException, Depends, Query, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from typing import Optional, List
+import asyncio
+import hashlib
 import logging
 import jwt
 import os
+import time
 
 from data_models.drill_models import (
     DrillItem,
@@ -20,8 +23,9 @@ from data_models.drill_models import (
     DrillListResponse,
     DrillStatsResponse
 )
-from repositories.drill_repository import get_drill_repository, DrillRepository
+from repositories.drill_repository import get_drill_repository, DrillRepository, DB_SOURCE
 from providers.drill_provider import get_drill_provider, DrillProvider
+from utils.cache import TTLCache
 
 router = APIRouter(prefix="/admin/drills", tags=["admin-drills"])
 logger = logging.getLogger(__name__)
@@ -32,6 +36,23 @@ security = HTTPBearer()
 JWT_SECRET = os.environ.get('JWT_SECRET', 'elite-soccer-ai-coach-secret-key-2024-change-in-production')
 JWT_ALGORITHM = 'HS256'
 
+# Decoder, key bytes and options built once instead of on every request.
+# Issued tokens always carry `exp`, so a token without one is rejected.
+_JWT = jwt.PyJWT()
+_JWT_KEY = JWT_SECRET.encode()
+_JWT_ALGORITHMS = (JWT_ALGORITHM,)
+_JWT_DECODE_OPTIONS = {"verify_signature": True, "require": ["exp"]}
+
+# Successfully decoded tokens, keyed by a digest of the token. Admin pages
+# send the same bearer on every call; entries still honour the token's own
+# `exp`, so the TTL only bounds how long a decode is reused.
+TOKEN_CACHE_TTL_SECONDS = 60.0
+_token_cache = TTLCache(ttl=TOKEN_CACHE_TTL_SECONDS, maxsize=4096)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
 
 def verify_token(credentials: HTTPAuthorizationCredentials) -> dict:
     """
@@ -43,9 +64,22 @@ def verify_token(credentials: HTTPAuthorizationCredentials) -> dict:
     Raises:
         HTTPException 401: If token is invalid or expired
     """
+    token = credentials.credentials
+    key = _token_key(token)
+    hit, cached = _token_cache.get(key)
+    if hit:
+        exp, user_info = cached
+        if exp > time.time():
+            return dict(user_info)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has expired"
+        )
+    
     try:
-        token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+        payload = _JWT.decode(
+            token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_DECODE_OPTIONS
+        )
         
         user_id = payload.get('user_id') or payload.get('sub')
         if not user_id:
@@ -54,11 +88,13 @@ def verify_token(credentials: HTTPAuthorizationCredentials) -> dict:
                 detail="Invalid token: missing user_id"
             )
         
-        return {
+        user_info = {
             'user_id': user_id,
             'username': payload.get('username', ''),
             'role': payload.get('role', 'player')
         }
+        _token_cache.set(key, (payload['exp'], user_info))
+        return dict(user_info)
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -181,30 +217,32 @@ async def list_drills(
     try:
         provider = get_drill_provider()
         
-        # Get all drills with filters
-        drills = await provider.get_all_drills(
-            section=section,
-            tag=tag,
-            age=age,
-            position=position
+        # Fetch only the requested page (plus the total match count) and
+        # the active source concurrently
+        (paginated_drills, total), active_source = await asyncio.gather(
+            provider.get_all_drills_paginated(
+                section=section,
+                tag=tag,
+                age=age,
+                position=position,
+                skip=(page - 1) * page_size,
+                limit=page_size
+            ),
+            provider.get_active_source()
         )
         
-        # Paginate
-        total = len(drills)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_drills = drills[start:end]
-        
-        # Get active source
-        active_source = await provider.get_active_source()
-        
-        # Convert to DrillItem models (filter out _source and _original)
+        # Convert to DrillItem models. Database drills were validated on
+        # upload, so build them without re-running validation; static
+        # drills are converted on the fly and still validated. Internal
+        # `_source`/`_original` keys are not DrillItem fields and are
+        # dropped by the model (`_id` is already projected away).
         drill_items = []
         for d in paginated_drills:
-            # Remove internal fields
-            clean = {k: v for k, v in d.items() if not k.startswith('_')}
+            if d.get('_source') == DB_SOURCE:
+                drill_items.append(DrillItem.model_construct(**d))
+                continue
             try:
-                drill_items.append(DrillItem(**clean))
+                drill_items.append(DrillItem(**d))
             except Exception:
                 # If conversion fails, skip this drill
                 logger.warning(f"Failed to convert drill: {d.get('drill_id')}")
@@ -277,9 +315,8 @@ async def get_drill(
                 detail=f"Drill not found: {drill_id}"
             )
         
-        # Remove internal fields
-        clean = {k: v for k, v in drill.items() if not k.startswith('_')}
-        return DrillItem(**clean)
+        # Internal fields are not DrillItem fields and are dropped by the model
+        return DrillItem(**drill)
         
     except HTTPException:
         raise
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
-from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Literal, Optional
+from datetime import datetime, timezone, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
+import re
 from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from bson.errors import InvalidId
 import os
 from models import User, UserCreate
 from utils.database import prepare_for_mongo, parse_from_mongo
+from repositories.base import ensure_index
 import bcrypt
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -16,6 +22,75 @@ MONGO_URL = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 client = AsyncIOMotorClient(MONGO_URL)
 db = client['soccer_coach_db']
 
+# bcrypt work factor (2^cost key setups per hash). The cost is stored in
+# each hash, so changing it only affects newly set passwords.
+BCRYPT_COST = int(os.environ.get('BCRYPT_COST', '10'))
+
+# bcrypt is CPU-bound (~100ms+ per hash) and releases the GIL, so hash in
+# worker threads instead of blocking the event loop
+_BCRYPT_POOL = ThreadPoolExecutor(
+    max_workers=max(2, os.cpu_count() or 1),
+    thread_name_prefix="bcrypt"
+)
+
+def _bcrypt_hash(password: str) -> str:
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=BCRYPT_COST)).decode('utf-8')
+
+async def _hash_password(password: str) -> str:
+    """Hash a password with bcrypt on the bcrypt thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BCRYPT_POOL, _bcrypt_hash, password)
+
+# Password hashes never leave the database on admin reads
+_NO_PASSWORD = {"hashed_password": 0}
+
+# Fields the admin user search matches against
+USER_SEARCH_FIELDS = ("name", "email", "username")
+
+# Page size when a cursor is passed without a limit
+USERS_PAGE_SIZE = 50
+
+
+def _stringify_ids(users: List[dict]) -> List[dict]:
+    """Render each user's ObjectId `_id` as a string so it serializes to JSON."""
+    for user in users:
+        if "_id" in user:
+            user["_id"] = str(user["_id"])
+    return users
+
+# (collection, field) pairs filtered by admin_delete_user's cascade; the
+# four relationship fields are separate so its $or can use index union
+CASCADE_INDEXES = (
+    ("assessments", "user_id"),
+    ("assessment_benchmarks", "user_id"),
+    ("periodized_programs", "player_name"),
+    ("training_programs", "player_name"),
+    ("relationships", "parent_id"),
+    ("relationships", "child_id"),
+    ("relationships", "coach_id"),
+    ("relationships", "player_id"),
+)
+
+async def ensure_indexes() -> None:
+    """
+    Create the user search, lookup and cascade-delete indexes (idempotent).
+    
+    Each index is created independently (ensure_index), so a conflict with
+    an existing index skips only that one.
+    """
+    await ensure_index(
+        db.users,
+        [(field, "text") for field in USER_SEARCH_FIELDS],
+        name="users_text"
+    )
+    # Prefix search range-scans one B-tree per field; email and username
+    # reuse the unique email_1/username_1 indexes from init-mongo.js
+    await ensure_index(db.users, "name")
+    await ensure_index(db.users, "role", name="users_role")
+    for collection, field in CASCADE_INDEXES:
+        await ensure_index(db[collection], field, name=f"{collection}_{field}")
+    await ensure_index(db.users, "id", unique=True, name="users_id_unique")
+
 # Helper function to verify admin role
 async def verify_admin(user_id: str) -> bool:
     """Verify user is admin"""
@@ -27,34 +102,89 @@ async def verify_admin(user_id: str) -> bool:
 @router.get("/users/all")
 async def get_all_users(
     role: Optional[str] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    search_mode: Literal["contains", "prefix", "words"] = "contains",
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None
 ):
-    """Get all users in the system (Admin only)"""
+    """
+    Get all users in the system (Admin only)
+    
+    search_mode for name/email/username:
+    - "contains" (default): case-insensitive substring match
+    - "prefix": case-sensitive starts-with match (index range scans)
+    - "words": whole-word text search (text index, stemmed), best first
+    
+    Without `limit` or `cursor` every match is returned (up to 1000), as
+    before. With either, pages hold `limit` users (default 50), newest
+    first; pass the returned `next_cursor` as `cursor` for the next page.
+    "words" results are ranked by relevance and return only the best
+    `limit` matches (no next page).
+    """
     try:
         query = {}
         
         if role:
             query["role"] = role
         
-        if search:
-            query["$or"] = [
-                {"name": {"$regex": search, "$options": "i"}},
-                {"email": {"$regex": search, "$options": "i"}},
-                {"username": {"$regex": search, "$options": "i"}}
-            ]
+        # User input is always escaped, so it cannot inject a regex pattern
+        if search and search_mode == "contains":
+            contains = {"$regex": re.escape(search), "$options": "i"}
+            query["$or"] = [{field: contains} for field in USER_SEARCH_FIELDS]
+        elif search and search_mode == "prefix":
+            # Anchored and case-sensitive, so each field's index is range-scanned
+            prefix = {"$regex": f"^{re.escape(search)}"}
+            query["$or"] = [{field: prefix} for field in USER_SEARCH_FIELDS]
+        elif search:
+            # Indexed word search over name/email/username (users_text),
+            # best matches first
+            query["$text"] = {"$search": search}
+            users = await db.users.find(
+                query, {**_NO_PASSWORD, "score": {"$meta": "textScore"}}
+            ).sort([("score", {"$meta": "textScore"})]).to_list(limit or 1000)
+            return {
+                "success": True,
+                "count": len(users),
+                "users": _stringify_ids(users),
+                "next_cursor": None
+            }
+        
+        if limit is None and cursor is None:
+            users = await db.users.find(query, _NO_PASSWORD).to_list(1000)
+            return {
+                "success": True,
+                "count": len(users),
+                "users": _stringify_ids(users),
+                "next_cursor": None
+            }
+        
+        limit = limit or USERS_PAGE_SIZE
         
-        users = await db.users.find(query).to_list(1000)
+        # Keyset pagination on _id: each page walks the _id index from the
+        # previous page's last id, holding at most limit + 1 documents
+        if cursor:
+            try:
+                query["_id"] = {"$lt": ObjectId(cursor)}
+            except InvalidId:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
         
-        # Remove sensitive data
-        for user in users:
-            if "hashed_password" in user:
-                del user["hashed_password"]
+        users = await db.users.find(query, _NO_PASSWORD).sort("_id", -1).limit(
+            limit + 1
+        ).to_list(limit + 1)
+        
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = str(users[-1]["_id"])
         
         return {
             "success": True,
             "count": len(users),
-            "users": users
+            "users": _stringify_ids(users),
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching all users: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -63,14 +193,10 @@ async def get_all_users(
 async def get_user_by_id(user_id: str):
     """Get user details by ID (Admin only)"""
     try:
-        user = await db.users.find_one({"id": user_id})
+        user = await db.users.find_one({"id": user_id}, _NO_PASSWORD)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        # Remove sensitive data
-        if "hashed_password" in user:
-            del user["hashed_password"]
-        
         return {
             "success": True,
             "user": user
@@ -97,14 +223,14 @@ async def admin_create_user(user: UserCreate):
             raise HTTPException(status_code=400, detail="User with this email or username already exists")
         
         # Hash password
-        hashed_password = bcrypt.hashpw(user.password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = await _hash_password(user.password)
         
         # Create user object
         new_user = User(
             username=user.username,
             email=user.email,
             name=user.name,
-            hashed_password=hashed_password.decode('utf-8'),
+            hashed_password=hashed_password,
             role=user.role,
             age=user.age,
             position=user.position
@@ -186,7 +312,10 @@ async def admin_update_user(
 async def admin_delete_user(user_id: str):
     """Delete user (Admin only)"""
     try:
-        user = await db.users.find_one({"id": user_id})
+        user = await db.users.find_one(
+            {"id": user_id},
+            {"_id": 0, "role": 1, "email": 1, "username": 1, "name": 1}
+        )
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -197,26 +326,30 @@ async def admin_delete_user(user_id: str):
         # Delete user
         await db.users.delete_one({"id": user_id})
         
-        # Also delete related data
-        # Delete assessments
-        await db.assessments.delete_many({"user_id": user_id})
-        await db.assessment_benchmarks.delete_many({"user_id": user_id})
-        
-        # Delete training programs
+        # Also delete related data; the collections are independent, so
+        # the deletes run concurrently
+        deletes = [
+            # Assessments
+            db.assessments.delete_many({"user_id": user_id}),
+            db.assessment_benchmarks.delete_many({"user_id": user_id}),
+            # Relationships
+            db.relationships.delete_many({
+                "$or": [
+                    {"parent_id": user_id},
+                    {"child_id": user_id},
+                    {"coach_id": user_id},
+                    {"player_id": user_id}
+                ]
+            })
+        ]
+        
+        # Training programs
         player_name = user.get("username") or user.get("name")
         if player_name:
-            await db.periodized_programs.delete_many({"player_name": player_name})
-            await db.training_programs.delete_many({"player_name": player_name})
+            deletes.append(db.periodized_programs.delete_many({"player_name": player_name}))
+            deletes.append(db.training_programs.delete_many({"player_name": player_name}))
         
-        # Delete relationships
-        await db.relationships.delete_many({
-            "$or": [
-                {"parent_id": user_id},
-                {"child_id": user_id},
-                {"coach_id": user_id},
-                {"player_id": user_id}
-            ]
-        })
+        await asyncio.gather(*deletes)
         
         logger.info(f"✅ Admin deleted user {user_id} and all related data")
         
@@ -239,12 +372,12 @@ async def admin_reset_password(user_id: str, new_password: str):
             raise HTTPException(status_code=404, detail="User not found")
         
         # Hash new password
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = await _hash_password(new_password)
         
         await db.users.update_one(
             {"id": user_id},
             {"$set": {
-                "hashed_password": hashed_password.decode('utf-8'),
+                "hashed_password": hashed_password,
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
@@ -267,30 +400,39 @@ async def admin_reset_password(user_id: str, new_password: str):
 async def get_system_stats():
     """Get system-wide statistics (Admin only)"""
     try:
-        # Count users by role
-        total_users = await db.users.count_documents({})
-        players = await db.users.count_documents({"role": "player"})
-        coaches = await db.users.count_documents({"role": "coach"})
-        parents = await db.users.count_documents({"role": "parent"})
-        clubs = await db.users.count_documents({"role": "club"})
-        admins = await db.users.count_documents({"role": "admin"})
-        
-        # Count assessments
-        total_assessments = await db.assessment_benchmarks.count_documents({})
-        
-        # Count training programs
-        total_programs = await db.training_programs.count_documents({})
-        
-        # Count clubs and teams
-        total_clubs = await db.clubs.count_documents({})
-        total_teams = await db.teams.count_documents({})
-        
-        # Recent registrations (last 7 days)
-        from datetime import timedelta
+        # Users are scanned once: total, per-role and recent-registration
+        # counts come from a single $facet; the other collections are
+        # counted concurrently with it
         week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-        recent_users = await db.users.count_documents({
-            "created_at": {"$gte": week_ago}
-        })
+        user_facets = db.users.aggregate([{"$facet": {
+            "total": [{"$count": "n"}],
+            "by_role": [{"$group": {"_id": "$role", "n": {"$sum": 1}}}],
+            "recent": [{"$match": {"created_at": {"$gte": week_ago}}}, {"$count": "n"}]
+        }}]).to_list(1)
+        
+        (
+            user_stats,
+            total_assessments,
+            total_programs,
+            total_clubs,
+            total_teams
+        ) = await asyncio.gather(
+            user_facets,
+            db.assessment_benchmarks.count_documents({}),
+            db.training_programs.count_documents({}),
+            db.clubs.count_documents({}),
+            db.teams.count_documents({})
+        )
+        
+        user_stats = user_stats[0] if user_stats else {}
+        by_role = {item["_id"]: item["n"] for item in user_stats.get("by_role", [])}
+        total_users = user_stats["total"][0]["n"] if user_stats.get("total") else 0
+        recent_users = user_stats["recent"][0]["n"] if user_stats.get("recent") else 0
+        players = by_role.get("player", 0)
+        coaches = by_role.get("coach", 0)
+        parents = by_role.get("parent", 0)
+        clubs = by_role.get("club", 0)
+        admins = by_role.get("admin", 0)
         
         return {
             "success": True,
@@ -321,16 +463,11 @@ async def get_recent_activity():
     """Get recent system activity (Admin only)"""
     try:
         # Get recent users
-        recent_users = await db.users.find({}).sort("created_at", -1).limit(10).to_list(10)
+        recent_users = await db.users.find({}, _NO_PASSWORD).sort("created_at", -1).limit(10).to_list(10)
         
         # Get recent assessments
         recent_assessments = await db.assessment_benchmarks.find({}).sort("saved_at", -1).limit(10).to_list(10)
         
-        # Remove sensitive data
-        for user in recent_users:
-            if "hashed_password" in user:
-                del user["hashed_password"]
-        
         return {
             "success": True,
             "recent_users": recent_users,
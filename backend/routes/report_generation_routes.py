@@ -8,6 +8,8 @@ from routes.auth_routes import verify_token
 import uuid
 import os
 import json
+import re
+from collections import OrderedDict
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -23,6 +25,64 @@ except ImportError:
     llm_available = False
     logger.warning("emergentintegrations not installed - LLM features will be limited")
 
+# Non-blank lines of LLM output, stripped (one regex pass instead of
+# split('\n') + strip() per line)
+_NONBLANK_LINE_RE = re.compile(r'^[^\S\n]*(\S.*?)[^\S\n]*$', re.MULTILINE)
+
+# Memoized analysis results, keyed by assessment identity + version (see
+# _analysis_cache_key). Cached dicts are shared and must not be mutated.
+ANALYSIS_CACHE_MAXSIZE = 256
+_analysis_cache: "OrderedDict[tuple, dict]" = OrderedDict()
+
+
+def _doc_version(doc: dict) -> tuple:
+    """(id, last-modified) pair identifying one revision of a stored document."""
+    return (doc.get('id'), str(doc.get('updated_at') or doc.get('created_at') or ''))
+
+
+def _analysis_cache_key(assessment: dict, previous_assessments: list, include_training: bool) -> Optional[tuple]:
+    """
+    Cache key for analyze_assessment_with_llm, or None if the input can't be keyed.
+    
+    Includes today's date because the next-assessment text embeds it.
+    Standards are derived from the assessment's age, so they're covered
+    by the assessment version.
+    """
+    if not assessment.get('id'):
+        return None
+    return (
+        _doc_version(assessment),
+        tuple(_doc_version(prev) for prev in previous_assessments),
+        include_training,
+        datetime.now().date()
+    )
+
+
+def analyze_assessment_cached(assessment: dict, previous_assessments: list, standards: dict, include_training: bool) -> dict:
+    """
+    analyze_assessment_with_llm with an LRU over (assessment, previous, flags).
+    
+    Regenerating a report for an unchanged assessment reuses the previous
+    analysis. Runs synchronously inside the event loop, so no lock is needed.
+    """
+    key = _analysis_cache_key(assessment, previous_assessments, include_training)
+    if key is not None and key in _analysis_cache:
+        _analysis_cache.move_to_end(key)
+        return _analysis_cache[key]
+    
+    result = analyze_assessment_with_llm(
+        assessment=assessment,
+        previous_assessments=previous_assessments,
+        standards=standards,
+        include_training=include_training
+    )
+    if key is not None:
+        _analysis_cache[key] = result
+        if len(_analysis_cache) > ANALYSIS_CACHE_MAXSIZE:
+            _analysis_cache.popitem(last=False)
+    return result
+
+
 class ReportGenerationRequest(BaseModel):
     assessment_id: str
     include_comparison: bool = True
@@ -83,7 +143,7 @@ async def generate_report(
             previous_assessments = prev_assessments
         
         # Generate comprehensive analysis using the assessment data
-        analysis_result = analyze_assessment_with_llm(
+        analysis_result = analyze_assessment_cached(
             assessment=assessment,
             previous_assessments=previous_assessments,
             standards=standards,
@@ -867,8 +927,9 @@ Weeks 9-12: [Focus areas and goals]
                     if section.startswith('OVERALL ANALYSIS:'):
                         ai_analysis = section.replace('OVERALL ANALYSIS:', '').strip()
                     elif section.startswith('COACH RECOMMENDATIONS:'):
-                        recs = section.replace('COACH RECOMMENDATIONS:', '').strip().split('\n')
-                        coach_recommendations = [r.strip() for r in recs if r.strip()]
+                        coach_recommendations = _NONBLANK_LINE_RE.findall(
+                            section.replace('COACH RECOMMENDATIONS:', '')
+                        )
                     elif section.startswith('STANDARDS COMPARISON:'):
                         comp = section.replace('STANDARDS COMPARISON:', '').strip()
                         standards_comparison = {'analysis': comp}
@@ -2451,6 +2451,35 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def ensure_db_indexes():
+    """Create repository indexes; failures are logged, never fatal."""
+    from repositories.assessment_repository import AssessmentRepository
+    from repositories.drill_repository import get_drill_repository
+    from repositories.elite_training_repository import get_elite_training_repository
+    from repositories.progress_repository import ProgressRepository
+    from repositories.training_repository import TrainingRepository
+    from repositories.user_repository import UserRepository
+    from repositories.vo2_repository import VO2Repository
+    from routes import admin_routes
+    # One failure (e.g. existing duplicates under a unique index) must not
+    # stop the other collections from getting their indexes
+    for name, ensure in (
+        ("admin users", admin_routes.ensure_indexes),
+        ("assessments", AssessmentRepository.ensure_indexes),
+        ("drills", get_drill_repository().ensure_indexes),
+        ("elite training", get_elite_training_repository().ensure_indexes),
+        ("progress", ProgressRepository.ensure_indexes),
+        ("training", TrainingRepository.ensure_indexes),
+        ("users", UserRepository.ensure_indexes),
+        ("vo2", VO2Repository.ensure_indexes),
+    ):
+        try:
+            await ensure()
+            logging.info(f"✅ {name} indexes ensured")
+        except Exception as e:
+            logging.warning(f"Could not ensure {name} indexes: {e}")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
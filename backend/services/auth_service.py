@@ -6,6 +6,7 @@ import os
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Tuple
 from fastapi import HTTPException, status
+from pymongo.errors import DuplicateKeyError
 
 from domain.models import User, UserCreate, UserLogin
 from repositories.user_repository import (
@@ -115,7 +116,15 @@ class AuthService:
         user_dict['created_at'] = datetime.now(timezone.utc).isoformat()
         user_dict['last_login'] = datetime.now(timezone.utc).isoformat()
         
-        created_user = await self.user_repo.create(user_dict)
+        try:
+            created_user = await self.user_repo.create(user_dict)
+        except DuplicateKeyError as e:
+            # Lost a race with a concurrent registration past the checks above
+            key_pattern = (e.details or {}).get("keyPattern") or {}
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered" if "email" in key_pattern else "Username already taken"
+            )
         
         # Create default profile
         await self.profile_repo.create_default_profile(created_user['id'])
@@ -2,7 +2,11 @@
 
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone, timedelta
-from repositories.progress_repository import ProgressRepository
+from repositories.progress_repository import (
+    ProgressRepository,
+    ASSESSMENT_SUMMARY_PROJECTION,
+    PROGRAM_SCHEDULE_PROJECTION
+)
 from models import (
     DailyProgress, DailyProgressCreate, WeeklyProgress, WeeklyProgressCreate,
     PerformanceMetric, ExerciseCompletion
@@ -131,7 +135,9 @@ class ProgressService:
     ) -> Dict[str, Any]:
         """Get a comprehensive progress summary for a player."""
         # Get latest assessment for baseline
-        assessment = await self.repository.find_latest_assessment(player_id)
+        assessment = await self.repository.find_latest_assessment(
+            player_id, ASSESSMENT_SUMMARY_PROJECTION
+        )
         
         if not assessment:
             raise ProgressNotFoundError("No assessment found for player")
@@ -169,7 +175,9 @@ class ProgressService:
         """Update performance metrics based on completed exercises."""
         try:
             # Get current program to determine phase and week
-            program = await self.repository.find_latest_program(player_id)
+            program = await self.repository.find_latest_program(
+                player_id, PROGRAM_SCHEDULE_PROJECTION
+            )
             
             if not program:
                 return
@@ -177,19 +185,22 @@ class ProgressService:
             current_week = self._calculate_current_week(program)
             current_phase = self._calculate_current_phase(program)
             
-            # Update metrics based on exercise performance
-            for exercise in completed_exercises:
-                if exercise.performance_rating and exercise.performance_rating >= 4:
-                    # Good performance - create positive metric entry
-                    metric = PerformanceMetric(
-                        player_id=player_id,
-                        metric_name=f"{exercise.exercise_id}_performance",
-                        value=exercise.performance_rating,
-                        phase_number=current_phase,
-                        week_number=current_week
-                    )
-                    
-                    await self.repository.create_performance_metric(metric.dict())
+            # Update metrics based on exercise performance (one write for all)
+            metrics = [
+                # Good performance - create positive metric entry
+                PerformanceMetric(
+                    player_id=player_id,
+                    metric_name=f"{exercise.exercise_id}_performance",
+                    value=exercise.performance_rating,
+                    phase_number=current_phase,
+                    week_number=current_week
+                ).dict()
+                for exercise in completed_exercises
+                if exercise.performance_rating and exercise.performance_rating >= 4
+            ]
+            
+            if metrics:
+                await self.repository.create_performance_metrics(metrics)
             
         except Exception as e:
             logger.error(f"Error updating performance metrics: {e}")
@@ -257,7 +268,9 @@ class ProgressService:
     async def _get_next_assessment_date(self, player_id: str) -> Optional[datetime]:
         """Get the next assessment date for a player."""
         try:
-            program = await self.repository.find_latest_program(player_id)
+            program = await self.repository.find_latest_program(
+                player_id, PROGRAM_SCHEDULE_PROJECTION
+            )
             
             if program:
                 next_date = program.get("next_assessment_date")
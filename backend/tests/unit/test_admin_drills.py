@@ -9,6 +9,7 @@ Tests for admin drill upload functionality:
 - Stats and list endpoints
 """
 
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
@@ -206,6 +207,52 @@ class TestAdminDrillsAuth:
         )
         assert response.status_code == 401
     
+    def test_verify_token_reuses_decoded_token_until_exp(self):
+        """Test that a repeated bearer is decoded once but still expires."""
+        from fastapi.security import HTTPAuthorizationCredentials
+        from routes import admin_drills_routes
+        
+        admin_drills_routes._token_cache.clear()
+        exp = datetime.utcnow() + timedelta(minutes=5)
+        token = jwt.encode(
+            {"user_id": "admin-1", "role": "admin", "exp": exp},
+            admin_drills_routes.JWT_SECRET,
+            algorithm=admin_drills_routes.JWT_ALGORITHM
+        )
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        
+        with patch.object(admin_drills_routes._JWT, 'decode', wraps=admin_drills_routes._JWT.decode) as decode:
+            first = admin_drills_routes.verify_token(credentials)
+            second = admin_drills_routes.verify_token(credentials)
+            assert first == second == {'user_id': 'admin-1', 'username': '', 'role': 'admin'}
+            assert decode.call_count == 1
+            
+            # Past the token's own exp the cached entry is rejected
+            with patch.object(admin_drills_routes.time, 'time', return_value=exp.timestamp() + 3600):
+                with pytest.raises(HTTPException) as exc_info:
+                    admin_drills_routes.verify_token(credentials)
+            assert exc_info.value.status_code == 401
+            assert decode.call_count == 1
+    
+    def test_verify_token_requires_exp(self):
+        """Test that a token without an exp claim is rejected."""
+        from fastapi.security import HTTPAuthorizationCredentials
+        from routes import admin_drills_routes
+        
+        admin_drills_routes._token_cache.clear()
+        token = jwt.encode(
+            {"user_id": "admin-1", "role": "admin"},
+            admin_drills_routes.JWT_SECRET,
+            algorithm=admin_drills_routes.JWT_ALGORITHM
+        )
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            admin_drills_routes.verify_token(credentials)
+        
+        assert exc_info.value.status_code == 401
+        assert len(admin_drills_routes._token_cache) == 0
+    
     @patch('routes.admin_drills_routes.verify_token')
     def test_upload_with_non_admin_token_returns_403(self, mock_verify, client):
         """Test that upload with non-admin token returns 403."""
@@ -313,9 +360,8 @@ class TestDrillRepository:
         repo = DrillRepository()
         repo._db = mock_db
         
-        # Mock find_one to return None (drill doesn't exist)
-        mock_db.drills.find_one = AsyncMock(return_value=None)
-        mock_db.drills.insert_one = AsyncMock()
+        # Upsert reports an inserted _id (drill didn't exist)
+        mock_db.drills.update_one = AsyncMock(return_value=MagicMock(upserted_id="oid-1"))
         
         result = await repo.upsert_drill(
             {"drill_id": "new_drill", "name": "New Drill", "section": "technical"},
@@ -324,7 +370,13 @@ class TestDrillRepository:
         
         assert result['action'] == 'inserted'
         assert result['drill_id'] == 'new_drill'
-        mock_db.drills.insert_one.assert_called_once()
+        
+        # One round-trip: upsert by drill_id, creation fields only on insert
+        mock_db.drills.update_one.assert_called_once()
+        args, kwargs = mock_db.drills.update_one.call_args
+        assert args[0] == {"drill_id": "new_drill"}
+        assert args[1]["$setOnInsert"]["created_by"] == "admin-123"
+        assert kwargs["upsert"] is True
     
     @pytest.mark.asyncio
     async def test_upsert_drill_update(self, mock_db):
@@ -334,23 +386,23 @@ class TestDrillRepository:
         repo = DrillRepository()
         repo._db = mock_db
         
-        # Mock find_one to return existing drill
-        mock_db.drills.find_one = AsyncMock(return_value={
-            "drill_id": "existing_drill",
-            "name": "Old Name",
-            "created_at": "2024-01-01T00:00:00Z",
-            "created_by": "original-admin"
-        })
-        mock_db.drills.update_one = AsyncMock()
+        # Upsert matched an existing drill (no upserted _id)
+        mock_db.drills.update_one = AsyncMock(return_value=MagicMock(upserted_id=None))
         
         result = await repo.upsert_drill(
-            {"drill_id": "existing_drill", "name": "New Name", "section": "tactical"},
+            {"drill_id": "existing_drill", "name": "New Name", "section": "tactical",
+             "created_by": "someone-else"},
             admin_id="admin-456"
         )
         
         assert result['action'] == 'updated'
         assert result['drill_id'] == 'existing_drill'
         mock_db.drills.update_one.assert_called_once()
+        
+        # Original created_by is preserved: never part of $set
+        update = mock_db.drills.update_one.call_args[0][1]
+        assert "created_by" not in update["$set"]
+        assert update["$set"]["name"] == "New Name"
     
     @pytest.mark.asyncio
     async def test_upsert_many(self, mock_db):
@@ -361,18 +413,266 @@ class TestDrillRepository:
         repo._db = mock_db
         
         # First drill is new, second exists
-        mock_db.drills.find_one = AsyncMock(side_effect=[None, {"drill_id": "drill_2"}])
-        mock_db.drills.insert_one = AsyncMock()
-        mock_db.drills.update_one = AsyncMock()
+        mock_db.drills.bulk_write = AsyncMock(
+            return_value=MagicMock(upserted_count=1, matched_count=1)
+        )
         
         result = await repo.upsert_many([
             {"drill_id": "drill_1", "name": "Drill 1", "section": "technical"},
-            {"drill_id": "drill_2", "name": "Drill 2", "section": "tactical"}
+            {"drill_id": "drill_2", "name": "Drill 2", "section": "tactical",
+             "created_at": "2020-01-01T00:00:00Z"}
         ], admin_id="admin-123")
         
         assert result['inserted'] == 1
         assert result['updated'] == 1
+        
+        # Single round-trip, upserting by drill_id
+        mock_db.drills.bulk_write.assert_called_once()
+        ops = mock_db.drills.bulk_write.call_args[0][0]
+        assert [op._filter for op in ops] == [{"drill_id": "drill_1"}, {"drill_id": "drill_2"}]
+        assert all(op._upsert for op in ops)
+        
+        # Creation fields are only written on insert, never overwritten
+        update = ops[1]._doc
+        assert "created_at" not in update["$set"]
+        assert update["$setOnInsert"]["created_by"] == "admin-123"
+        assert update["$set"]["name"] == "Drill 2"
+    
+    @pytest.mark.asyncio
+    async def test_find_by_id_stamps_source_in_query(self, mock_db):
+        """Test that drill reads are stamped with _source by MongoDB."""
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[
+            {"drill_id": "drill_1", "name": "Drill 1", "_source": "database"}
+        ])
+        mock_db.drills.aggregate = MagicMock(return_value=cursor)
+        
+        drill = await repo.find_by_id("drill_1")
+        
+        assert drill['drill_id'] == "drill_1"
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"drill_id": "drill_1", "is_active": True}}
+        assert {"$limit": 1} in pipeline
+        assert pipeline[-1] == {"$set": {"_source": "database"}}
 
+    
+    @pytest.mark.asyncio
+    async def test_search_drills_uses_text_index(self, mock_db):
+        """Test that name search uses $text, or an escaped regex for partial matches."""
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        mock_db.drills.aggregate = MagicMock(return_value=cursor)
+        
+        await repo.search_drills(query="passing")
+        match = mock_db.drills.aggregate.call_args[0][0][0]["$match"]
+        assert match["$text"] == {"$search": "passing"}
+        assert "name" not in match
+        
+        await repo.search_drills(query="1v1 (rondo)", partial=True)
+        match = mock_db.drills.aggregate.call_args[0][0][0]["$match"]
+        assert "$text" not in match
+        assert match["name"].search("Tight 1V1 (Rondo) Box")
+        assert not match["name"].search("1v1 rondo")
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_drill_ids_do_not_block_text_index(self, mock_db):
+        """Test that a failed unique drill_id build leaves the text index built."""
+        from pymongo.errors import DuplicateKeyError
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        async def create_index(keys, **kwargs):
+            if kwargs.get("unique"):
+                raise DuplicateKeyError("E11000 duplicate key error")
+        
+        mock_db.drills.create_index = AsyncMock(side_effect=create_index)
+        
+        await repo.ensure_indexes()
+        
+        names = [c.kwargs["name"] for c in mock_db.drills.create_index.await_args_list]
+        assert names == ["drill_text", "section_is_active", "tags_is_active", "drill_id"]
+    
+    @pytest.mark.asyncio
+    async def test_find_all_keyset_pagination(self, mock_db):
+        """Test that find_all pages by drill_id when given `after`."""
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        mock_db.drills.aggregate = MagicMock(return_value=cursor)
+        
+        await repo.find_all(section="technical", after="drill_050", limit=50)
+        
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        assert pipeline[0]["$match"]["drill_id"] == {"$gt": "drill_050"}
+        assert pipeline[1] == {"$sort": {"drill_id": 1}}
+        assert {"$limit": 50} in pipeline
+        assert not any("$skip" in stage for stage in pipeline)
+    
+    @pytest.mark.asyncio
+    async def test_find_all_projects_requested_fields(self, mock_db):
+        """Test that `fields` narrows the $project stage (never returning _id)."""
+        from repositories.drill_repository import DrillRepository, DRILL_CARD_FIELDS
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[])
+        mock_db.drills.aggregate = MagicMock(return_value=cursor)
+        
+        await repo.find_all(section="cardio", fields=DRILL_CARD_FIELDS)
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        projection = next(stage["$project"] for stage in pipeline if "$project" in stage)
+        assert projection == {**dict.fromkeys(DRILL_CARD_FIELDS, 1), "_id": 0}
+        
+        await repo.find_all(section="gym")
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        assert {"$project": {"_id": 0}} in pipeline
+    
+    @pytest.mark.asyncio
+    async def test_find_all_rejects_oversized_page(self, mock_db):
+        """Test that list reads refuse limits above MAX_PAGE_SIZE."""
+        from repositories.drill_repository import DrillRepository
+        from repositories.base import MAX_PAGE_SIZE
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        mock_db.drills.aggregate = MagicMock()
+        
+        with pytest.raises(ValueError):
+            await repo.find_all(limit=MAX_PAGE_SIZE + 1)
+        with pytest.raises(ValueError):
+            await repo.search_drills(query="passing", limit=0)
+        mock_db.drills.aggregate.assert_not_called()
+    
+    def test_drill_query_combines_age_and_position(self):
+        """Test that age and position filters must both match."""
+        from repositories.drill_repository import _drill_query
+        
+        query = _drill_query(age=14, position="winger")
+        
+        assert "$or" not in query
+        age_min, age_max, position = query["$and"]
+        assert {"age_min": {"$lte": 14}} in age_min["$or"]
+        assert {"age_max": {"$gte": 14}} in age_max["$or"]
+        assert position == {"$or": [{"positions": "winger"}, {"positions": "any"}]}
+        assert _drill_query() == {"is_active": True}
+    
+    @pytest.mark.asyncio
+    async def test_iter_all_streams_in_batches(self, mock_db):
+        """Test that iter_all yields drills from the cursor without to_list."""
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        docs = [{"drill_id": "drill_001"}, {"drill_id": "drill_002"}]
+        
+        class Cursor:
+            def __init__(self):
+                self._docs = iter(docs)
+            
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                try:
+                    return next(self._docs)
+                except StopIteration:
+                    raise StopAsyncIteration
+        
+        mock_db.drills.aggregate = MagicMock(return_value=Cursor())
+        
+        streamed = [d async for d in repo.iter_all(section="technical", batch_size=50)]
+        
+        assert [d["drill_id"] for d in streamed] == ["drill_001", "drill_002"]
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        assert pipeline[0]["$match"] == {"is_active": True, "section": "technical"}
+        assert pipeline[1] == {"$sort": {"drill_id": 1}}
+        assert not any("$limit" in stage for stage in pipeline)
+        assert mock_db.drills.aggregate.call_args[1] == {"batchSize": 50}
+    
+    @pytest.mark.asyncio
+    async def test_page_with_stats_single_facet(self, mock_db):
+        """Test that page, total and section counts come from one aggregation."""
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[{
+            "rows": [{"drill_id": "drill_001", "_source": "database"}],
+            "total": [{"n": 12}],
+            "by_section": [{"_id": "technical", "count": 12}]
+        }])
+        mock_db.drills.aggregate = MagicMock(return_value=cursor)
+        
+        result = await repo.page_with_stats(skip=10, limit=5)
+        
+        mock_db.drills.aggregate.assert_called_once()
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"is_active": True}}
+        rows = pipeline[1]["$facet"]["rows"]
+        assert rows[:3] == [{"$sort": {"drill_id": 1}}, {"$skip": 10}, {"$limit": 5}]
+        assert result == {
+            "rows": [{"drill_id": "drill_001", "_source": "database"}],
+            "total": 12,
+            "by_section": {"technical": 12}
+        }
+        
+        # limit=0: counts only, and an empty match yields zero
+        cursor.to_list = AsyncMock(return_value=[{"total": [], "by_section": []}])
+        result = await repo.page_with_stats(limit=0)
+        assert "rows" not in mock_db.drills.aggregate.call_args[0][0][1]["$facet"]
+        assert result == {"rows": [], "total": 0, "by_section": {}}
+        
+        # Repeated stats reads are served from the drill cache until a write
+        await repo.page_with_stats(limit=0)
+        assert mock_db.drills.aggregate.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_find_page_facets_rows_and_total(self, mock_db):
+        """Test that a filtered page and its total share one aggregation."""
+        from repositories.drill_repository import DrillRepository
+        
+        repo = DrillRepository()
+        repo._db = mock_db
+        
+        cursor = MagicMock()
+        cursor.to_list = AsyncMock(return_value=[{
+            "rows": [{"drill_id": "drill_051", "_source": "database"}],
+            "total": [{"n": 51}]
+        }])
+        mock_db.drills.aggregate = MagicMock(return_value=cursor)
+        
+        result = await repo.find_page(section="technical", skip=50, limit=50)
+        
+        mock_db.drills.aggregate.assert_called_once()
+        pipeline = mock_db.drills.aggregate.call_args[0][0]
+        assert pipeline[0] == {"$match": {"is_active": True, "section": "technical"}}
+        assert set(pipeline[1]["$facet"]) == {"rows", "total"}
+        assert pipeline[1]["$facet"]["rows"][1:3] == [{"$skip": 50}, {"$limit": 50}]
+        assert result == {
+            "rows": [{"drill_id": "drill_051", "_source": "database"}],
+            "total": 51
+        }
 
 # =============================================================================
 # PROVIDER TESTS
@@ -422,6 +722,30 @@ class TestDrillProvider:
             active_source = await provider.get_active_source()
             assert active_source == "static"
     
+    @pytest.mark.asyncio
+    async def test_auto_mode_caches_db_probe(self):
+        """Test that auto mode reuses the DB count until the probe expires."""
+        from providers.drill_provider import DrillProvider, reset_drill_provider
+        
+        reset_drill_provider()
+        
+        with patch.dict(os.environ, {'DRILLS_SOURCE': 'auto'}):
+            mock_repo = MagicMock()
+            mock_repo.count_drills = AsyncMock(return_value=10)
+            
+            provider = DrillProvider(repository=mock_repo)
+            
+            assert await provider.get_active_source() == "database"
+            assert await provider.is_db_available() is True
+            assert await provider._should_use_db() is True
+            mock_repo.count_drills.assert_awaited_once()
+            
+            # Expire the probe: next call re-counts
+            provider._probe_expires_at = 0.0
+            mock_repo.count_drills = AsyncMock(return_value=0)
+            assert await provider.get_active_source() == "static"
+            mock_repo.count_drills.assert_awaited_once()
+    
     @pytest.mark.asyncio
     async def test_db_mode_always_uses_db(self):
         """Test that db mode always uses database."""
@@ -478,6 +802,76 @@ class TestDrillProvider:
             assert drill['section'] == "speed_agility"  # Converted from "speed"
             assert drill['_source'] == "static"
     
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_db_probe(self):
+        """Test that gathered calls on an expired probe issue a single count."""
+        from providers.drill_provider import DrillProvider, reset_drill_provider
+        
+        reset_drill_provider()
+        
+        with patch.dict(os.environ, {'DRILLS_SOURCE': 'auto'}):
+            mock_repo = MagicMock()
+            
+            async def slow_count():
+                await asyncio.sleep(0)
+                return 10
+            
+            mock_repo.count_drills = AsyncMock(side_effect=slow_count)
+            
+            provider = DrillProvider(repository=mock_repo)
+            
+            sources = await asyncio.gather(
+                provider.get_active_source(),
+                provider.get_active_source(),
+                provider.get_active_source()
+            )
+            
+            assert sources == ["database"] * 3
+            mock_repo.count_drills.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_get_all_drills_paginated_pushes_page_to_db(self):
+        """Test that only the requested page is fetched from the DB."""
+        from providers.drill_provider import DrillProvider, reset_drill_provider
+        
+        reset_drill_provider()
+        
+        with patch.dict(os.environ, {'DRILLS_SOURCE': 'db'}):
+            mock_repo = MagicMock()
+            mock_repo.find_page = AsyncMock(return_value={
+                "rows": [{"drill_id": "drill_051"}],
+                "total": 51
+            })
+            
+            provider = DrillProvider(repository=mock_repo)
+            
+            drills, total = await provider.get_all_drills_paginated(
+                section="technical", skip=50, limit=50
+            )
+            
+            assert drills == [{"drill_id": "drill_051"}]
+            assert total == 51
+            mock_repo.find_page.assert_awaited_once()
+            assert mock_repo.find_page.call_args[1]['section'] == "technical"
+            assert mock_repo.find_page.call_args[1]['skip'] == 50
+            assert mock_repo.find_page.call_args[1]['limit'] == 50
+    
+    @pytest.mark.asyncio
+    async def test_get_all_drills_paginated_static_slices(self):
+        """Test that static drills are paginated in memory with the full total."""
+        from providers.drill_provider import DrillProvider, reset_drill_provider
+        from exercise_database import EXERCISE_DATABASE
+        
+        reset_drill_provider()
+        
+        with patch.dict(os.environ, {'DRILLS_SOURCE': 'static'}):
+            provider = DrillProvider(repository=MagicMock())
+            
+            drills, total = await provider.get_all_drills_paginated(skip=1, limit=2)
+            
+            assert total == len(EXERCISE_DATABASE)
+            assert len(drills) == min(2, max(total - 1, 0))
+    
     @pytest.mark.asyncio
     async def test_get_stats(self):
         """Test getting drill statistics."""
@@ -487,11 +881,14 @@ class TestDrillProvider:
         
         with patch.dict(os.environ, {'DRILLS_SOURCE': 'auto'}):
             mock_repo = MagicMock()
-            mock_repo.count_drills = AsyncMock(return_value=25)
-            mock_repo.count_by_section = AsyncMock(return_value={
-                "technical": 10,
-                "tactical": 8,
-                "cardio": 7
+            mock_repo.page_with_stats = AsyncMock(return_value={
+                "rows": [],
+                "total": 25,
+                "by_section": {
+                    "technical": 10,
+                    "tactical": 8,
+                    "cardio": 7
+                }
             })
             
             provider = DrillProvider(repository=mock_repo)
@@ -503,6 +900,28 @@ class TestDrillProvider:
             assert stats['source_mode'] == 'auto'
             assert stats['db_available'] is True
             assert 'technical' in stats['sections']
+            assert stats['active_source'] == 'database'
+            mock_repo.page_with_stats.assert_awaited_once_with(limit=0)
+    
+    @pytest.mark.asyncio
+    async def test_get_stats_db_unavailable(self):
+        """Test stats fall back to static when the DB count fails."""
+        from providers.drill_provider import DrillProvider, reset_drill_provider
+        
+        reset_drill_provider()
+        
+        with patch.dict(os.environ, {'DRILLS_SOURCE': 'auto'}):
+            mock_repo = MagicMock()
+            mock_repo.page_with_stats = AsyncMock(side_effect=Exception("connection refused"))
+            
+            provider = DrillProvider(repository=mock_repo)
+            
+            stats = await provider.get_stats()
+            
+            assert stats['db_count'] == 0
+            assert stats['db_available'] is False
+            assert stats['sections'] == {}
+            assert stats['active_source'] == 'static'
 
 
 # =============================================================================
@@ -723,6 +1142,42 @@ class TestAdminDrillsIntegration:
         assert data['static_count'] == 10
         assert data['source_mode'] == 'auto'
         assert data['active_source'] == 'database'
+    
+    @patch('routes.admin_drills_routes.verify_token')
+    @patch('routes.admin_drills_routes.get_drill_provider')
+    def test_list_endpoint_skips_only_invalid_static_drills(self, mock_provider, mock_verify, client):
+        """Test list builds DB drills directly and still validates static ones."""
+        from data_models.drill_models import DrillItem
+        
+        mock_verify.return_value = {
+            'user_id': 'admin-123',
+            'role': 'admin'
+        }
+        
+        mock_prov = MagicMock()
+        mock_prov.get_all_drills_paginated = AsyncMock(return_value=([
+            {"drill_id": "db_1", "name": "DB Drill", "section": "technical",
+             "tags": ["passing"], "_source": "database"},
+            {"drill_id": "static_1", "name": "Static Drill", "section": "cardio",
+             "_source": "static", "_original": {"category": "physical"}},
+            {"drill_id": "static_bad", "name": "", "section": "cardio",
+             "_source": "static"}
+        ], 3))
+        mock_prov.get_active_source = AsyncMock(return_value='database')
+        mock_provider.return_value = mock_prov
+        
+        with patch('data_models.drill_models.DrillItem.model_construct',
+                   wraps=DrillItem.model_construct) as construct:
+            response = client.get(
+                "/api/admin/drills",
+                headers={"Authorization": "Bearer admin_token"}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [d['drill_id'] for d in data['drills']] == ["db_1", "static_1"]
+        assert all(not k.startswith('_') for d in data['drills'] for k in d)
+        assert construct.call_count == 1
 
 
 if __name__ == "__main__":
@@ -0,0 +1,157 @@
+"""
+Admin Routes Unit Tests
+=======================
+
+Tests for the system admin user listing and index bootstrap.
+All tests use mocks - no real MongoDB required.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from pymongo.errors import OperationFailure
+
+
+def make_users_db(users):
+    """Mock db whose users.find(...) chain returns `users`."""
+    mock_db = MagicMock()
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=users)
+    mock_db.users.find = MagicMock(return_value=cursor)
+    return mock_db
+
+
+class TestUserSearch:
+    """Test the search modes of GET /admin/users/all."""
+
+    @pytest.mark.asyncio
+    async def test_default_search_is_case_insensitive_substring(self):
+        """Test that "smith" still matches "John Smith" by default."""
+        from routes import admin_routes
+
+        mock_db = make_users_db([{"id": "u1", "name": "John Smith"}])
+        with patch.object(admin_routes, 'db', mock_db):
+            result = await admin_routes.get_all_users(
+                role=None, search="smith", search_mode="contains", limit=50, cursor=None
+            )
+
+        query, projection = mock_db.users.find.call_args[0]
+        assert query["$or"][0] == {"name": {"$regex": "smith", "$options": "i"}}
+        assert projection == {"hashed_password": 0}
+        assert result["users"] == [{"id": "u1", "name": "John Smith"}]
+
+    @pytest.mark.asyncio
+    async def test_search_input_is_escaped(self):
+        """Test that regex metacharacters in the search are matched literally."""
+        from routes import admin_routes
+
+        mock_db = make_users_db([])
+        with patch.object(admin_routes, 'db', mock_db):
+            await admin_routes.get_all_users(
+                role=None, search="a.b+", search_mode="prefix", limit=50, cursor=None
+            )
+
+        query = mock_db.users.find.call_args[0][0]
+        assert query["$or"][1] == {"email": {"$regex": r"^a\.b\+"}}
+
+    @pytest.mark.asyncio
+    async def test_words_mode_uses_text_index(self):
+        """Test that "words" runs a $text search ranked by score."""
+        from routes import admin_routes
+
+        mock_db = make_users_db([])
+        with patch.object(admin_routes, 'db', mock_db):
+            await admin_routes.get_all_users(
+                role="player", search="john", search_mode="words", limit=50, cursor=None
+            )
+
+        query = mock_db.users.find.call_args[0][0]
+        assert query == {"role": "player", "$text": {"$search": "john"}}
+
+
+class TestAdminIndexes:
+    """Test index bootstrap against init-mongo.js indexes."""
+
+    @pytest.mark.asyncio
+    async def test_conflict_does_not_skip_remaining_indexes(self):
+        """Test that one conflicting index leaves the others to be built."""
+        from routes import admin_routes
+
+        mock_db = MagicMock()
+        mock_db.users.create_index = AsyncMock(
+            side_effect=OperationFailure("IndexOptionsConflict", code=85)
+        )
+        cascade = MagicMock()
+        cascade.create_index = AsyncMock()
+        mock_db.__getitem__.return_value = cascade
+
+        with patch.object(admin_routes, 'db', mock_db):
+            await admin_routes.ensure_indexes()
+
+        assert cascade.create_index.await_count == len(admin_routes.CASCADE_INDEXES)
+        # email/username are served by init-mongo's unique indexes
+        created = [call.args[0] for call in mock_db.users.create_index.await_args_list]
+        assert "email" not in created and "username" not in created
+
+
+class TestUserListing:
+    """Test the unpaged and paged forms of GET /admin/users/all."""
+
+    @pytest.mark.asyncio
+    async def test_no_limit_or_cursor_returns_full_list(self):
+        """Test that the portal's plain call still gets every user."""
+        from routes import admin_routes
+
+        users = [{"_id": i, "id": f"u{i}"} for i in range(60)]
+        mock_db = make_users_db(users)
+        with patch.object(admin_routes, 'db', mock_db):
+            result = await admin_routes.get_all_users(
+                role=None, search=None, search_mode="contains", limit=None, cursor=None
+            )
+
+        mock_db.users.find.return_value.to_list.assert_awaited_once_with(1000)
+        assert result["count"] == 60
+        assert result["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_limit_pages_with_next_cursor(self):
+        """Test that an explicit limit returns one page and a cursor."""
+        from bson import ObjectId
+        from routes import admin_routes
+
+        users = [{"_id": ObjectId(), "id": f"u{i}"} for i in range(3)]
+        mock_db = make_users_db(users)
+        with patch.object(admin_routes, 'db', mock_db):
+            result = await admin_routes.get_all_users(
+                role=None, search=None, search_mode="contains", limit=2, cursor=None
+            )
+
+        assert result["count"] == 2
+        assert result["next_cursor"] == str(users[1]["_id"])
+
+    @pytest.mark.parametrize("params", [
+        {},
+        {"limit": 2},
+        {"search": "john", "search_mode": "words"},
+    ])
+    def test_response_serializes_object_ids(self, params):
+        """Test that every listing form survives JSON encoding over HTTP."""
+        from bson import ObjectId
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from routes import admin_routes
+
+        ids = [ObjectId() for _ in range(3)]
+        mock_db = make_users_db([{"_id": oid, "id": f"u{i}"} for i, oid in enumerate(ids)])
+        app = FastAPI()
+        app.include_router(admin_routes.router, prefix="/api")
+
+        with patch.object(admin_routes, 'db', mock_db):
+            response = TestClient(app).get("/api/admin/users/all", params=params)
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["users"][0]["_id"] == str(ids[0])
+        if "limit" in params:
+            assert body["next_cursor"] == str(ids[1])
@@ -0,0 +1,141 @@
+"""
+Query Result Cache
+==================
+
+In-process TTL + LRU cache for hot repository reads whose underlying data
+changes rarely (e.g. the drill library).
+
+Entries are cached per process (per worker), keyed by
+(repository instance, method, arguments), and expire after `ttl` seconds.
+Writers invalidate a whole namespace so readers on the same worker see
+their own writes immediately; other workers converge within `ttl`.
+
+Cached values are never handed out directly: every hit returns a deep copy,
+so callers can mutate results (including nested rows) without touching the
+cached entry.
+
+Usage:
+    from utils.cache import async_ttl_cache, invalidate
+
+    class DrillRepository:
+        @async_ttl_cache("drill", ttl=60)
+        async def find_by_section(self, section): ...
+
+        async def upsert_drill(self, ...):
+            ...
+            invalidate("drill")
+"""
+
+import copy
+import functools
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MAXSIZE = 512
+
+
+class TTLCache:
+    """LRU cache whose entries also expire after a fixed TTL (monotonic clock)."""
+
+    __slots__ = ("ttl", "maxsize", "_data", "_lock")
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, maxsize: int = DEFAULT_MAXSIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value); expired entries count as misses and are dropped."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return False, None
+            self._data.move_to_end(key)
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# namespace -> cache (one per namespace, shared by all methods using it)
+_caches: Dict[str, TTLCache] = {}
+
+
+def get_cache(namespace: str) -> Optional[TTLCache]:
+    """Return the cache registered for a namespace, if any."""
+    return _caches.get(namespace)
+
+
+def invalidate(namespace: str) -> None:
+    """Drop every cached entry in a namespace (call after writes)."""
+    cache = _caches.get(namespace)
+    if cache is not None:
+        cache.clear()
+
+
+def clear_all() -> None:
+    """Drop every cached entry in every namespace (tests, admin resets)."""
+    for cache in _caches.values():
+        cache.clear()
+
+
+def _copy_result(value: Any) -> Any:
+    """Hand out a caller-owned deep copy of a cached value."""
+    if value is None:
+        return None
+    return copy.deepcopy(value)
+
+
+def async_ttl_cache(
+    namespace: str,
+    ttl: float = DEFAULT_TTL_SECONDS,
+    maxsize: int = DEFAULT_MAXSIZE
+) -> Callable:
+    """
+    Cache an async method's results in `namespace` for `ttl` seconds.
+
+    Calls with unhashable arguments (e.g. list filters) bypass the cache.
+    `None` results are cached too, so repeated misses don't hit the DB.
+    """
+    cache = _caches.setdefault(namespace, TTLCache(ttl=ttl, maxsize=maxsize))
+
+    def decorator(func: Callable) -> Callable:
+        name = func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = (self, name, args, tuple(sorted(kwargs.items())))
+            try:
+                hit, value = cache.get(key)
+            except TypeError:
+                # Unhashable argument: not cacheable
+                return await func(self, *args, **kwargs)
+            if hit:
+                return _copy_result(value)
+
+            value = await func(self, *args, **kwargs)
+            cache.set(key, value)
+            return _copy_result(value)
+
+        return wrapper
+
+    return decorator
@@ -6,52 +6,95 @@ import os
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
 database_name = os.environ.get('DB_NAME', 'soccer_training_db')
-client = AsyncIOMotorClient(mongo_url)
+
+# Connection pool sizing for the shared async client. Non-blocking IO
+# multiplexes requests, so a smaller pool than the driver default (100)
+# serves admin bursts; a warm floor avoids cold TCP/TLS/auth handshakes.
+MONGO_POOL_OPTIONS = {
+    "maxPoolSize": int(os.environ.get('MONGO_MAX_POOL_SIZE', '50')),
+    "minPoolSize": int(os.environ.get('MONGO_MIN_POOL_SIZE', '5')),
+    "maxIdleTimeMS": int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '30000')),
+    "waitQueueTimeoutMS": int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '2500')),
+    "serverSelectionTimeoutMS": int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '3000')),
+}
+
+client = AsyncIOMotorClient(mongo_url, **MONGO_POOL_OPTIONS)
 db = client[database_name]
 
 def get_database():
     """Get database connection"""
     return db
 
+_UTC = timezone.utc
+
+def utcnow_iso() -> str:
+    """Current UTC time as the ISO string stored in documents (millisecond precision)."""
+    return datetime.now(_UTC).isoformat(timespec="milliseconds")
+
 def prepare_for_mongo(data: Dict[str, Any]) -> Dict[str, Any]:
     """Prepare data for MongoDB storage by converting Python objects to serializable formats"""
     if isinstance(data, dict):
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, datetime):
-                result[key] = value.isoformat()
-            elif isinstance(value, date):
-                result[key] = value.isoformat()
-            elif isinstance(value, time):
-                result[key] = value.strftime('%H:%M:%S')
-            elif isinstance(value, dict):
-                result[key] = prepare_for_mongo(value)
-            elif isinstance(value, list):
-                result[key] = [prepare_for_mongo(item) if isinstance(item, dict) else item for item in value]
-            else:
-                result[key] = value
-        return result
+        return {key: _prepare_value(value) for key, value in data.items()}
     return data
 
+def _iso(value: Any) -> str:
+    return value.isoformat()
+
+def _hms(value: time) -> str:
+    return value.strftime('%H:%M:%S')
+
+def _prepare_list(items: list) -> list:
+    return [prepare_for_mongo(item) if isinstance(item, dict) else item for item in items]
+
+# Exact-type dispatch for prepare_for_mongo: one set/dict lookup per value
+# instead of an isinstance chain; subclasses fall back to isinstance below
+_PASSTHROUGH_TYPES = frozenset({str, int, float, bool, type(None)})
+_PREPARERS = {datetime: _iso, date: _iso, time: _hms, dict: prepare_for_mongo, list: _prepare_list}
+
+def _prepare_value(value: Any) -> Any:
+    cls = type(value)
+    if cls in _PASSTHROUGH_TYPES:
+        return value
+    prepare = _PREPARERS.get(cls)
+    if prepare is None:
+        if isinstance(value, date):  # includes datetime subclasses
+            prepare = _iso
+        elif isinstance(value, time):
+            prepare = _hms
+        elif isinstance(value, dict):
+            prepare = prepare_for_mongo
+        elif isinstance(value, list):
+            prepare = _prepare_list
+        else:
+            return value
+    return prepare(value)
+
+# Fields stored as ISO strings by prepare_for_mongo and parsed back to datetimes
+_DATE_FIELDS = frozenset({
+    'created_at', 'updated_at', 'test_date', 'completion_date', 'measurement_date',
+    'start_date', 'end_date', 'assessment_date', 'program_start_date', 'next_assessment_date',
+    'retest_date', 'date', 'last_login', 'saved_at', 'benchmark_date'
+})
+
+
+def _parse_iso(value: str) -> Any:
+    """ISO string -> datetime (accepting a trailing 'Z'); unparseable values pass through."""
+    try:
+        # Handle ISO format with timezone
+        if value.endswith('Z'):
+            return datetime.fromisoformat(value[:-1] + '+00:00')
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
 def parse_from_mongo(data: Dict[str, Any]) -> Dict[str, Any]:
     """Parse data from MongoDB by converting string dates back to Python objects"""
     if isinstance(data, dict):
         result = {}
         for key, value in data.items():
-            if key in ['created_at', 'updated_at', 'test_date', 'completion_date', 'measurement_date', 
-                      'start_date', 'end_date', 'assessment_date', 'program_start_date', 'next_assessment_date', 
-                      'retest_date', 'date', 'last_login', 'saved_at', 'benchmark_date']:
-                if isinstance(value, str):
-                    try:
-                        # Handle ISO format with timezone
-                        if value.endswith('Z'):
-                            result[key] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-                        else:
-                            result[key] = datetime.fromisoformat(value)
-                    except ValueError:
-                        result[key] = value
-                else:
-                    result[key] = value
+            if key in _DATE_FIELDS:
+                result[key] = _parse_iso(value) if isinstance(value, str) else value
             elif isinstance(value, dict):
                 result[key] = parse_from_mongo(value)
             elif isinstance(value, list):
@@ -499,6 +499,51 @@ class TestUserIdLinking:
         assert result.player_name == "john_doe"
 
 
+# ============================================================================
+# TEST: REPOSITORY INDEXES
+# ============================================================================
+
+class TestAssessmentIndexes:
+    """Test index bootstrap and keyset paging queries."""
+    
+    @pytest.mark.asyncio
+    async def test_index_conflict_does_not_skip_remaining_indexes(self):
+        """An index conflict is logged and the other indexes are still created."""
+        from pymongo.errors import OperationFailure
+        from repositories.assessment_repository import AssessmentRepository
+        
+        mock_db = MagicMock()
+        mock_db.assessments.create_index = AsyncMock(side_effect=[
+            "user_id_1_created_at_-1",
+            OperationFailure("Index already exists with a different name", code=85),
+            "created_at_-1",
+            "user_id_baseline"
+        ])
+        
+        with patch('repositories.assessment_repository.db', mock_db):
+            await AssessmentRepository.ensure_indexes()
+        
+        assert mock_db.assessments.create_index.await_count == 4
+        # Shared key patterns use the default names init-mongo.js uses
+        assert "name" not in mock_db.assessments.create_index.await_args_list[1].kwargs
+    
+    def test_keyset_bound_breaks_created_at_ties_by_id(self):
+        """Assessments sharing the boundary created_at are not skipped."""
+        from repositories.assessment_repository import _created_before
+        
+        stamp = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        query = _created_before({"user_id": "u1"}, (stamp, "a-0042"))
+        
+        assert query == {
+            "user_id": "u1",
+            "$or": [
+                {"created_at": {"$lt": stamp.isoformat()}},
+                {"created_at": stamp.isoformat(), "id": {"$lt": "a-0042"}}
+            ]
+        }
+        assert _created_before({"user_id": "u1"}, None) == {"user_id": "u1"}
+
+
 # ============================================================================
 # RUN TESTS
 # ============================================================================
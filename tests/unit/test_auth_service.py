@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 from fastapi import HTTPException
+from pymongo.errors import DuplicateKeyError
 from services.auth_service import AuthService
 from domain.models import UserCreate, UserLogin, User
 
@@ -140,6 +141,27 @@ class TestAuthService:
         assert "username already taken" in exc_info.value.detail.lower()
         mock_user_repo.create.assert_not_called()
     
+    @pytest.mark.asyncio
+    async def test_register_user_duplicate_key_race(self, auth_service, mock_user_repo):
+        """Test a unique-index rejection after the checks maps to a 400."""
+        mock_user_repo.create.side_effect = DuplicateKeyError(
+            "E11000 duplicate key error", 11000, {"keyPattern": {"email": 1}}
+        )
+        
+        user_data = UserCreate(
+            username="testuser",
+            email="test@example.com",
+            full_name="Test User",
+            password="password123",
+            role="player"
+        )
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.register_user(user_data)
+        
+        assert exc_info.value.status_code == 400
+        assert "email already registered" in exc_info.value.detail.lower()
+    
     @pytest.mark.asyncio
     async def test_login_user_success(self, auth_service, mock_user_repo):
         """Test successful user login."""
@@ -397,6 +397,55 @@ class TestServiceSingleton:
         assert service1 is service2
 
 
+# ============================================================================
+# TEST: REPOSITORY INDEX HOOK
+# ============================================================================
+
+class TestRepositoryIndexes:
+    """Test ensure_indexes when other workers or init scripts got there first."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrently_created_collection_does_not_abort_indexes(self):
+        """A NamespaceExists race on create_collection should not skip the indexes."""
+        from pymongo.errors import OperationFailure
+        from repositories.elite_training_repository import EliteTrainingRepository
+        
+        repo = EliteTrainingRepository()
+        repo._db = MagicMock()
+        repo._db.list_collection_names = AsyncMock(return_value=[])
+        repo._db.create_collection = AsyncMock(
+            side_effect=OperationFailure("Collection already exists", code=48)
+        )
+        collection = MagicMock()
+        collection.create_index = AsyncMock(
+            side_effect=[OperationFailure("IndexOptionsConflict", code=85), None, None, None, None]
+        )
+        for name in ("elite_training_plans", "wellness_logs", "load_monitoring",
+                     "testing_data", "match_schedules"):
+            setattr(repo._db, name, collection)
+        
+        await repo.ensure_indexes()
+        
+        assert repo._db.create_collection.await_count == 2
+        assert collection.create_index.await_count == 5
+    
+    @pytest.mark.asyncio
+    async def test_other_create_collection_errors_propagate(self):
+        """Errors other than NamespaceExists should still surface."""
+        from pymongo.errors import OperationFailure
+        from repositories.elite_training_repository import EliteTrainingRepository
+        
+        repo = EliteTrainingRepository()
+        repo._db = MagicMock()
+        repo._db.list_collection_names = AsyncMock(return_value=[])
+        repo._db.create_collection = AsyncMock(
+            side_effect=OperationFailure("not authorized", code=13)
+        )
+        
+        with pytest.raises(OperationFailure):
+            await repo.ensure_collections()
+
+
 # ============================================================================
 # TEST: INTEGRATION (FastAPI TestClient)
 # ============================================================================
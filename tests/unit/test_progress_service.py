@@ -21,7 +21,7 @@ from services.progress_service import (
     ProgressNotFoundError,
     get_progress_service
 )
-
+from repositories.progress_repository import ASSESSMENT_SUMMARY_PROJECTION
 
 # ============================================================================
 # TEST: IMPROVEMENT TRENDS CALCULATION
@@ -236,6 +236,26 @@ class TestDailyProgressCRUD:
         mock_repo.create_daily_progress.assert_called_once()
         assert result.player_id == "player-123"
     
+    @pytest.mark.asyncio
+    async def test_performance_metrics_written_in_one_batch(self, service, mock_repo):
+        """Well-rated exercises should produce one batched metrics write."""
+        from models import ExerciseCompletion
+        
+        mock_repo.find_latest_program = AsyncMock(return_value={"macro_cycles": []})
+        mock_repo.create_performance_metrics = AsyncMock(return_value=[])
+        
+        exercises = [
+            ExerciseCompletion(player_id="player-123", exercise_id=f"ex-{rating}",
+                               routine_id="routine-1", performance_rating=rating)
+            for rating in (5, 2, 4, None)
+        ]
+        
+        await service._update_performance_metrics("player-123", exercises)
+        
+        mock_repo.create_performance_metrics.assert_awaited_once()
+        metrics = mock_repo.create_performance_metrics.call_args[0][0]
+        assert [m["metric_name"] for m in metrics] == ["ex-5_performance", "ex-4_performance"]
+    
     @pytest.mark.asyncio
     async def test_get_daily_progress(self, service, mock_repo):
         """Test getting daily progress."""
@@ -362,6 +382,10 @@ class TestProgressSummary:
         
         assert result["training_sessions_30_days"] == 15
         assert result["training_consistency_percentage"] == 50.0  # 15/30 * 100
+        # Only summary fields are read from the (large) assessment document
+        mock_repo.find_latest_assessment.assert_awaited_once_with(
+            "player-123", ASSESSMENT_SUMMARY_PROJECTION
+        )
     
     @pytest.mark.asyncio
     async def test_caps_consistency_at_100(self, service, mock_repo):
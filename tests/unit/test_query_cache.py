@@ -0,0 +1,139 @@
+"""
+Tests for the in-process query result cache
+============================================
+
+Verifies TTL expiry, LRU eviction, namespace invalidation and that
+cached results are handed out as caller-owned copies.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add backend to path
+backend_path = Path(__file__).parent.parent.parent / "backend"
+sys.path.insert(0, str(backend_path))
+
+from utils.cache import TTLCache, async_ttl_cache, invalidate, clear_all
+
+
+class FakeRepository:
+    """Counts backend calls behind cached methods."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    @async_ttl_cache("test_ns", ttl=60)
+    async def find(self, key, limit=10):
+        self.calls += 1
+        return [{"key": key, "limit": limit}]
+    
+    @async_ttl_cache("test_ns", ttl=60)
+    async def find_many(self, keys):
+        self.calls += 1
+        return [{"key": k} for k in keys]
+    
+    @async_ttl_cache("test_ns", ttl=60)
+    async def find_page(self, key):
+        self.calls += 1
+        return {"rows": [{"key": key, "tags": ["a"]}], "next_cursor": None}
+
+
+@pytest.fixture(autouse=True)
+def _clean_cache():
+    clear_all()
+    yield
+    clear_all()
+
+
+# ============================================================================
+# TEST: TTL CACHE
+# ============================================================================
+
+class TestTTLCache:
+    """Test the TTLCache container."""
+    
+    def test_entries_expire_after_ttl(self):
+        cache = TTLCache(ttl=10, maxsize=4)
+        with patch("utils.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with patch("utils.cache.time.monotonic", return_value=105.0):
+            assert cache.get("a") == (True, 1)
+        with patch("utils.cache.time.monotonic", return_value=111.0):
+            assert cache.get("a") == (False, None)
+        assert len(cache) == 0
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = TTLCache(ttl=60, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") == (False, None)
+        assert cache.get("a") == (True, 1)
+        assert cache.get("c") == (True, 3)
+
+
+# ============================================================================
+# TEST: DECORATOR
+# ============================================================================
+
+class TestAsyncTTLCache:
+    """Test the async_ttl_cache method decorator."""
+    
+    async def test_repeat_calls_hit_cache(self):
+        repo = FakeRepository()
+        first = await repo.find("x", limit=5)
+        second = await repo.find("x", limit=5)
+        
+        assert first == second == [{"key": "x", "limit": 5}]
+        assert repo.calls == 1
+    
+    async def test_different_arguments_are_cached_separately(self):
+        repo = FakeRepository()
+        await repo.find("x")
+        await repo.find("y")
+        await repo.find("x", limit=20)
+        
+        assert repo.calls == 3
+    
+    async def test_instances_do_not_share_entries(self):
+        a, b = FakeRepository(), FakeRepository()
+        await a.find("x")
+        await b.find("x")
+        
+        assert (a.calls, b.calls) == (1, 1)
+    
+    async def test_invalidate_clears_namespace(self):
+        repo = FakeRepository()
+        await repo.find("x")
+        invalidate("test_ns")
+        await repo.find("x")
+        
+        assert repo.calls == 2
+    
+    async def test_unhashable_arguments_bypass_cache(self):
+        repo = FakeRepository()
+        await repo.find_many(["a", "b"])
+        await repo.find_many(["a", "b"])
+        
+        assert repo.calls == 2
+    
+    async def test_callers_get_independent_copies(self):
+        repo = FakeRepository()
+        first = await repo.find("x")
+        first[0]["key"] = "mutated"
+        first.append({"key": "extra"})
+        
+        assert await repo.find("x") == [{"key": "x", "limit": 10}]
+        
+        page = await repo.find_page("x")
+        page["rows"][0].pop("key")
+        page["rows"][0]["tags"].append("b")
+        page["rows"].append({"key": "extra"})
+        
+        assert await repo.find_page("x") == {
+            "rows": [{"key": "x", "tags": ["a"]}], "next_cursor": None
+        }
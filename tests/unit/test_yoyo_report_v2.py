@@ -9,6 +9,7 @@ Tests that verify:
 4. Report structure is valid
 """
 
+import json
 import pytest
 import sys
 from pathlib import Path
@@ -22,6 +23,8 @@ from reporting.yoyo_report_v2 import (
     YoYoReportV2Formatter,
     format_yoyo_report_v2,
     validate_report_structure,
+    dumps_report,
+    clear_report_caches,
     SECTION_TITLES
 )
 
@@ -359,6 +362,20 @@ class TestValidateReportStructure:
         assert validation['valid'] is False
         assert any('report_json' in err for err in validation['errors'])
     
+    def test_missing_expanded_keys_reported_in_order(self, minimal_assessment):
+        """Missing nested keys should be reported once each, in schema order."""
+        report = format_yoyo_report_v2(assessment=minimal_assessment)
+        expanded = report['report_json']['sub_program']['expanded_sections']
+        del expanded['prehab']
+        del expanded['technical']
+        
+        validation = validate_report_structure(report)
+        
+        assert validation['errors'] == [
+            "Missing expanded_sections key: technical",
+            "Missing expanded_sections key: prehab",
+        ]
+    
     def test_wrong_section_order_fails_validation(self, minimal_assessment):
         """Report with wrong section order should fail validation."""
         report = format_yoyo_report_v2(assessment=minimal_assessment)
@@ -407,6 +424,37 @@ class TestTrainingMode:
             assert report['report_json']['mode'] == "GK", f"Position '{pos}' should be GK mode"
 
 
+# ============================================================================
+# TEST: TRAINING PROGRAM
+# ============================================================================
+
+class TestTrainingProgram:
+    """Test coach recommendation classification."""
+    
+    def test_recommendations_classified_consistently(self, sample_generated_report):
+        """Section 7 and report_json should bucket recommendations the same way."""
+        report = format_yoyo_report_v2(generated_report=sample_generated_report)
+        
+        program = report['report_sections'][6]['content']
+        expanded = report['report_json']['sub_program']['expanded_sections']
+        
+        assert program['7.4_athletic_speed_agility'] == ["Focus on speed training"]
+        assert expanded['speed_agility'] == ["Focus on speed training"]
+        assert program['7.5_cardio'] == ["Work on endurance and cardio"]
+        assert expanded['cardio'] == {"recommendations": ["Work on endurance and cardio"]}
+        assert expanded['technical'] == ["Continue technical skill development"]
+        assert program['7.7_mobility_flexibility'] == ["N/A"]
+        assert expanded['mobility'] == []
+    
+    def test_empty_cardio_and_gym_are_empty_objects(self, minimal_assessment):
+        """Without matching recommendations, cardio/gym should be {}."""
+        report = format_yoyo_report_v2(assessment=minimal_assessment)
+        expanded = report['report_json']['sub_program']['expanded_sections']
+        
+        assert expanded['cardio'] == {}
+        assert expanded['gym'] == {}
+
+
 # ============================================================================
 # TEST: RETURN-TO-PLAY ENGINE
 # ============================================================================
@@ -434,6 +482,25 @@ class TestReturnToPlayEngine:
         rtp_section = report['report_sections'][7]
         assert rtp_section['content'] != "N/A"
         assert 'injury_status' in rtp_section['content']
+    
+    @pytest.mark.parametrize("placeholder", ["None", "none", " N/A ", ""])
+    def test_placeholder_injury_string_means_no_injury(self, placeholder):
+        """Placeholder strings (registration stores 'None') should not trigger RTP."""
+        report = format_yoyo_report_v2(
+            user={"full_name": "Healthy Player", "current_injuries": placeholder},
+            assessment={"player_name": "Healthy Player", "position": "Midfielder"}
+        )
+        
+        assert report['report_sections'][7]['content'] == "N/A"
+    
+    def test_placeholder_does_not_mask_later_source(self):
+        """A placeholder in one source should fall through to real injury data in the next."""
+        report = format_yoyo_report_v2(
+            user={"full_name": "Injured Player", "current_injuries": "Ankle sprain"},
+            assessment={"player_name": "Injured Player", "current_injuries": "None"}
+        )
+        
+        assert report['report_sections'][7]['content']['injury_status'] == "Ankle sprain"
 
 
 # ============================================================================
@@ -492,6 +559,13 @@ class TestDataPassthrough:
         assert identity['player_name'] == "Test Full Name"
         assert identity['age'] == 18
     
+    def test_identity_consistent_between_section_1_and_json(self):
+        """Section 1 and report_json should resolve the same player name."""
+        report = format_yoyo_report_v2(user={"id": "user-002", "username": "onlyusername"})
+        
+        assert report['report_sections'][0]['content']['player_name'] == "onlyusername"
+        assert report['report_json']['name'] == "onlyusername"
+    
     def test_strengths_weaknesses_from_generated_report(
         self, minimal_assessment, sample_generated_report
     ):
@@ -535,6 +609,153 @@ class TestMetaData:
         
         # Should parse without error
         datetime.fromisoformat(report['meta']['generated_at'].replace('Z', '+00:00'))
+    
+    def test_generated_at_can_be_supplied(self, minimal_assessment):
+        """A caller-supplied timestamp should be used as-is."""
+        ts = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+        report = format_yoyo_report_v2(assessment=minimal_assessment, generated_at=ts)
+        
+        assert report['meta']['generated_at'] == ts.isoformat()
+    
+    def test_generated_at_has_second_precision(self, minimal_assessment):
+        """Microseconds are not rendered in generated_at."""
+        ts = datetime(2024, 3, 1, 12, 0, 5, 123456, tzinfo=timezone.utc)
+        report = format_yoyo_report_v2(assessment=minimal_assessment, generated_at=ts)
+        
+        assert report['meta']['generated_at'] == "2024-03-01T12:00:05+00:00"
+
+
+# ============================================================================
+# TEST: PARTIAL REPORTS
+# ============================================================================
+
+class TestPartialReport:
+    """Test building a subset of the report."""
+    
+    def test_only_builds_requested_sections_in_order(self, complete_assessment):
+        """Requested sections come back in fixed order regardless of input order."""
+        report = format_yoyo_report_v2(assessment=complete_assessment, only=[6, 1])
+        
+        assert [s['section_number'] for s in report['report_sections']] == [1, 6]
+        assert report['meta']['section_count'] == 2
+        assert report['report_sections'][1]['content']['mode'] == "FIELD"
+    
+    def test_include_json_false_omits_report_json(self, minimal_assessment):
+        """Sections-only reports should not carry report_json."""
+        report = format_yoyo_report_v2(assessment=minimal_assessment, include_json=False)
+        
+        assert 'report_json' not in report
+        assert len(report['report_sections']) == 11
+    
+    def test_json_only(self, minimal_assessment):
+        """An empty section subset builds just the JSON object."""
+        report = format_yoyo_report_v2(assessment=minimal_assessment, only=())
+        
+        assert report['report_sections'] == []
+        assert report['report_json']['name'] == "Test Player"
+
+
+# ============================================================================
+# TEST: REPORT CACHE
+# ============================================================================
+
+class TestReportCache:
+    """Test memoization of rendered reports."""
+    
+    def setup_method(self):
+        clear_report_caches()
+    
+    def test_identical_inputs_reuse_rendered_report(self, complete_assessment):
+        """Same inputs should reuse the rendered JSON object."""
+        first = format_yoyo_report_v2(assessment=complete_assessment)
+        second = format_yoyo_report_v2(assessment=dict(complete_assessment))
+        
+        assert second['report_json'] is first['report_json']
+        assert second['report_sections'] == first['report_sections']
+    
+    def test_different_inputs_render_separately(self, complete_assessment):
+        """Changed inputs should never hit another report's cache entry."""
+        first = format_yoyo_report_v2(assessment=complete_assessment)
+        changed = {**complete_assessment, "player_name": "Someone Else"}
+        second = format_yoyo_report_v2(assessment=changed)
+        
+        assert second['report_json']['name'] == "Someone Else"
+        assert first['report_json']['name'] == "Complete Test Player"
+    
+    def test_reordering_returned_sections_does_not_leak(self, minimal_assessment):
+        """Each caller gets its own sections list."""
+        report = format_yoyo_report_v2(assessment=minimal_assessment)
+        report['report_sections'].reverse()
+        
+        again = format_yoyo_report_v2(assessment=minimal_assessment)
+        assert validate_report_structure(again)['valid'] is True
+    
+    def test_cache_can_be_bypassed(self, complete_assessment):
+        """use_cache=False should always render fresh objects."""
+        formatter = YoYoReportV2Formatter(assessment=complete_assessment)
+        first = formatter.generate_report(use_cache=False)
+        second = formatter.generate_report(use_cache=False)
+        
+        assert second['report_json'] is not first['report_json']
+        assert second['report_json'] == first['report_json']
+
+
+# ============================================================================
+# TEST: JSON SERIALIZATION
+# ============================================================================
+
+class TestJsonSerialization:
+    """Test report serialization to JSON bytes."""
+    
+    def test_to_json_bytes_round_trips(self, complete_assessment, sample_generated_report):
+        """Serialized report should decode back to the same structure."""
+        formatter = YoYoReportV2Formatter(
+            assessment=complete_assessment,
+            generated_report=sample_generated_report
+        )
+        data = json.loads(formatter.to_json_bytes())
+        
+        assert len(data['report_sections']) == 11
+        assert data['report_json']['name'] == "Complete Test Player"
+        assert data['meta']['report_version'] == "2.0"
+    
+    def test_cached_report_json_bytes_are_reused(self, complete_assessment):
+        """Repeat renders of the same inputs should reuse serialized report_json."""
+        clear_report_caches()
+        first = YoYoReportV2Formatter(assessment=complete_assessment)
+        first.generate_report()
+        second = YoYoReportV2Formatter(assessment=dict(complete_assessment))
+        
+        assert second.json_object_bytes() is first.json_object_bytes()
+        assert json.loads(second.to_json_bytes())['report_json'] == json.loads(first.json_object_bytes())
+    
+    def test_dumps_report_handles_non_json_types(self):
+        """Datetimes and unknown types should not break serialization."""
+        payload = {"created_at": datetime(2024, 1, 15, tzinfo=timezone.utc), "ref": object()}
+        data = json.loads(dumps_report(payload))
+        
+        assert data['created_at'].startswith("2024-01-15")
+        assert isinstance(data['ref'], str)
+    
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dumps_report_serializes_dataclasses_and_datetimes(self, monkeypatch, use_orjson):
+        """orjson and the stdlib fallback should agree on dataclasses and datetimes."""
+        from dataclasses import dataclass
+        import reporting.yoyo_report_v2 as report_module
+        
+        if use_orjson and not report_module.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(report_module, "ORJSON_AVAILABLE", use_orjson)
+        
+        @dataclass
+        class Point:
+            x: int
+            y: int
+        
+        payload = {"point": Point(1, 2), "at": datetime(2024, 1, 15, 8, 30, tzinfo=timezone.utc)}
+        data = json.loads(dumps_report(payload))
+        
+        assert data == {"point": {"x": 1, "y": 2}, "at": "2024-01-15T08:30:00Z"}
 
 
 # ============================================================================